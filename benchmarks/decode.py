@@ -0,0 +1,189 @@
+"""
+Compares decoders of stored chat histories and chats.
+
+Usage: PYTHONPATH=src python benchmarks/decode.py
+"""
+
+import datetime
+import timeit
+import typing
+import uuid
+
+import orjson
+
+from domain import attachments, chats, messages, participants, reactions
+from infrastructure.database.persistent import codec
+
+HISTORY_SIZES = (1_000, 10_000)
+CHAT_PARTICIPANTS = 100
+REPEATS = 5
+
+_datetime = datetime.datetime.fromisoformat
+
+
+def _optional_uuid(value: str | None) -> uuid.UUID | None:
+    return uuid.UUID(value) if value is not None else None
+
+
+def _optional_datetime(value: str | None) -> datetime.datetime | None:
+    return _datetime(value) if value is not None else None
+
+
+def construct_reaction(data: dict) -> reactions.Reaction:
+    return reactions.Reaction.model_construct(
+        reaction_id=uuid.UUID(data["reaction_id"]),
+        reactor=data["reactor"],
+        message_id=uuid.UUID(data["message_id"]),
+        emoji=data["emoji"],
+        created=_datetime(data["created"]),
+    )
+
+
+def construct_attachment(data: dict) -> attachments.Attachment:
+    return attachments.Attachment.model_construct(
+        attachment_id=uuid.UUID(data["attachment_id"]),
+        chat_id=uuid.UUID(data["chat_id"]),
+        message_sent_id=_optional_uuid(data["message_sent_id"]),
+        uploader=data["uploader"],
+        created=_datetime(data["created"]),
+        uploaded=_datetime(data["uploaded"]),
+        sent=_optional_datetime(data["sent"]),
+        status=attachments.AttachmentStatus(data["status"]),
+        urls=list(data["urls"]),
+        filename=data["filename"],
+        content_type=attachments.AttachmentType(data["content_type"]),
+        meta=data["meta"] or {},
+    )
+
+
+def construct_message(data: dict) -> messages.Message:
+    return messages.Message.model_construct(
+        chat_id=uuid.UUID(data["chat_id"]),
+        message_id=uuid.UUID(data["message_id"]),
+        sender=data["sender"],
+        reply_to=_optional_uuid(data["reply_to"]),
+        deleted=data["deleted"],
+        content=data["content"],
+        attachments=[construct_attachment(attachment) for attachment in data["attachments"]],
+        reactions=[construct_reaction(reaction) for reaction in data["reactions"]],
+        created=_datetime(data["created"]),
+        updated=_datetime(data["updated"]),
+    )
+
+
+def construct_pointer(data: dict | None) -> messages.MessagePointer | None:
+    if data is None:
+        return None
+    return messages.MessagePointer.model_construct(
+        chat_id=uuid.UUID(data["chat_id"]),
+        message_id=uuid.UUID(data["message_id"]),
+        created=_datetime(data["created"]),
+    )
+
+
+def construct_participant(data: dict) -> participants.Participant:
+    return participants.Participant.model_construct(
+        account_id=data["account_id"],
+        initiated_by=data["initiated_by"],
+        first_writer=data["first_writer"],
+        tags={participants.ChatTag.model_construct(tag=tag["tag"]) for tag in data["tags"]},
+        last_read_message=construct_pointer(data["last_read_message"]),
+    )
+
+
+def construct_chat(data: dict) -> chats.Chat:
+    return chats.Chat.model_construct(
+        chat_id=uuid.UUID(data["chat_id"]),
+        name=data["name"],
+        avatar=data["avatar"],
+        created=_datetime(data["created"]),
+        initiator=data["initiator"],
+        participants={
+            participant["account_id"]: construct_participant(participant) for participant in data["participants"]
+        },
+        last_message=construct_pointer(data["last_message"]),
+        last_activity_timestamp=_datetime(data["last_activity_timestamp"]),
+    )
+
+
+def make_history(size: int) -> list[bytes]:
+    chat_id = uuid.uuid4()
+    history = []
+    for number in range(size):
+        message = messages.Message(
+            chat_id=chat_id,
+            sender=f"account-{number % 5}",
+            content=f"message {number}",
+            reply_to=history[-1].message_id if history and number % 4 == 0 else None,
+        )
+        if number % 3 == 0:
+            message.attachments.append(
+                attachments.Attachment(
+                    chat_id=chat_id,
+                    uploader=message.sender,
+                    content_type=attachments.AttachmentType.IMAGE,
+                    status=attachments.AttachmentStatus.SENT,
+                    urls=[f"https://storage/{number}.jpg"],
+                ),
+            )
+        if number % 2 == 0:
+            message.reactions.append(
+                reactions.Reaction(reactor="account-0", message_id=message.message_id, emoji="+"),
+            )
+        history.append(message)
+    return [orjson.dumps(message.model_dump(mode="json")) for message in history]
+
+
+def make_chat(participants_count: int) -> bytes:
+    chat = chats.Chat(name="benchmark", initiator="account-0")
+    last_message = messages.Message(chat_id=chat.chat_id, sender="account-0", content="last")
+    chat.add_message(last_message)
+    chat.participants = {
+        f"account-{number}": participants.Participant(account_id=f"account-{number}", initiated_by="account-0")
+        for number in range(participants_count)
+    }
+    for participant in chat.participants.values():
+        participant.set_last_read_message(last_message)
+    return orjson.dumps(chat.model_dump(mode="json"))
+
+
+def measure(name: str, candidates: dict[str, typing.Callable[[], list]]) -> None:
+    results = {candidate: decode() for candidate, decode in candidates.items()}
+    expected = [entity.model_dump(mode="json") for entity in next(iter(results.values()))]
+    for candidate, entities in results.items():
+        assert [entity.model_dump(mode="json") for entity in entities] == expected, candidate
+
+    timings = {
+        candidate: min(timeit.repeat(decode, number=1, repeat=REPEATS)) for candidate, decode in candidates.items()
+    }
+    baseline = next(iter(timings.values()))
+    print(name)
+    for candidate, timing in timings.items():
+        print(f"    {candidate:<24} {timing * 1000:8.2f} ms  x{baseline / timing:.2f}")
+
+
+def main() -> None:
+    for size in HISTORY_SIZES:
+        history = make_history(size)
+        measure(
+            f"history of {size} messages",
+            {
+                "json + model_validate": lambda: [codec.load_message(raw) for raw in history],
+                "model_validate_json": lambda: [messages.Message.model_validate_json(raw) for raw in history],
+                "model_construct": lambda: [construct_message(orjson.loads(raw)) for raw in history],
+            },
+        )
+
+    chat = make_chat(CHAT_PARTICIPANTS)
+    measure(
+        f"100 chats of {CHAT_PARTICIPANTS} participants",
+        {
+            "json + model_validate": lambda: [codec.load_chat(chat) for _ in range(100)],
+            "model_validate_json": lambda: [chats.Chat.model_validate_json(chat) for _ in range(100)],
+            "model_construct": lambda: [construct_chat(orjson.loads(chat)) for _ in range(100)],
+        },
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Compares participant lookups, fan-out and decoding of chats with growing count of participants.
+
+Usage: PYTHONPATH=src python benchmarks/participants.py
+"""
+
+import timeit
+
+from decode import REPEATS, make_chat
+from domain import chats, participants
+from infrastructure.database.persistent import codec
+
+PARTICIPANTS_COUNTS = (10, 1_000, 10_000)
+LOOKUPS = 1_000
+
+
+def scan_participant(chat: chats.Chat, account_id: str) -> participants.Participant | None:
+    return next((p for p in chat.participants.values() if p.account_id == account_id), None)
+
+
+def measure(participants_count: int) -> None:
+    chat_bytes = codec.dump(codec.load_chat(make_chat(participants_count)))
+    chat = codec.load_chat(chat_bytes)
+    account_ids = [f"account-{number * participants_count // LOOKUPS}" for number in range(LOOKUPS)]
+    assert [chat.is_participant(account_id) for account_id in account_ids] == [
+        scan_participant(chat, account_id) for account_id in account_ids
+    ]
+
+    candidates = {
+        f"{LOOKUPS} lookups, scan": lambda: [scan_participant(chat, account_id) for account_id in account_ids],
+        f"{LOOKUPS} lookups, index": lambda: [chat.is_participant(account_id) for account_id in account_ids],
+        "fan-out receivers": lambda: list(chat.participants),
+        "decode": lambda: codec.load_chat(chat_bytes),
+        "encode": lambda: codec.dump(chat),
+    }
+    print(f"chat of {participants_count} participants, {len(chat_bytes) / 1024:.1f} KiB")
+    for candidate, run in candidates.items():
+        timing = min(timeit.repeat(run, number=1, repeat=REPEATS))
+        print(f"    {candidate:<24} {timing * 1000:10.3f} ms")
+
+
+def main() -> None:
+    for participants_count in PARTICIPANTS_COUNTS:
+        measure(participants_count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,126 @@
+"""
+Compares size, encode and decode time of legacy JSON, current binary storage format
+and msgpack layout with fields stored by position instead of names.
+
+Usage: PYTHONPATH=src python benchmarks/storage_format.py
+"""
+
+import functools
+import timeit
+import types
+import typing
+
+import msgpack
+import orjson
+import pydantic
+
+from decode import CHAT_PARTICIPANTS, HISTORY_SIZES, REPEATS, make_chat, make_history
+from domain import chats, messages
+from infrastructure.database.persistent import codec
+
+
+def encode_json(entity: pydantic.BaseModel) -> bytes:
+    return orjson.dumps(entity.model_dump(mode="json"))
+
+
+# Fields of models are stored as arrays in order of declaration, nested models are rebuilt by model fields
+def nested_model(annotation: typing.Any) -> tuple[type[pydantic.BaseModel] | None, bool]:
+    origin = typing.get_origin(annotation)
+    if origin in (typing.Union, types.UnionType):
+        layouts = [nested_model(arg) for arg in typing.get_args(annotation) if arg is not type(None)]
+        return next((layout for layout in layouts if layout[0] is not None), (None, False))
+    if origin in (list, set, dict):
+        return nested_model(typing.get_args(annotation)[-1])[0], True
+    if isinstance(annotation, type) and issubclass(annotation, pydantic.BaseModel):
+        return annotation, False
+    return None, False
+
+
+@functools.cache
+def stored_fields(model: type[pydantic.BaseModel]) -> tuple[tuple[str, ...], list[tuple[str, typing.Any, bool]]]:
+    names = tuple(name for name, field in model.model_fields.items() if not field.exclude)
+    nested = [(name, *nested_model(model.model_fields[name].annotation)) for name in names]
+    return names, [(name, nested, collection) for name, nested, collection in nested if nested is not None]
+
+
+def to_fields(data: dict, model: type[pydantic.BaseModel]) -> list:
+    names, nested = stored_fields(model)
+    for name, nested_model_type, collection in nested:
+        if (value := data.get(name)) is not None:
+            data[name] = (
+                [to_fields(item, nested_model_type) for item in value]
+                if collection
+                else to_fields(value, nested_model_type)
+            )
+    return [data[name] for name in names]
+
+
+def from_fields(values: list, model: type[pydantic.BaseModel]) -> dict:
+    names, nested = stored_fields(model)
+    data = dict(zip(names, values))
+    for name, nested_model_type, collection in nested:
+        if (value := data.get(name)) is not None:
+            data[name] = (
+                [from_fields(item, nested_model_type) for item in value]
+                if collection
+                else from_fields(value, nested_model_type)
+            )
+    return data
+
+
+def encode_fields(entity: pydantic.BaseModel) -> bytes:
+    return msgpack.packb(  # pyright: ignore[reportReturnType]
+        to_fields(codec._to_python(entity), type(entity)),
+        default=codec._pack,
+    )
+
+
+def decode_fields(raw: bytes, model: type[pydantic.BaseModel]) -> pydantic.BaseModel:
+    return model.model_validate(from_fields(msgpack.unpackb(raw), model))
+
+
+def snapshot(entity: pydantic.BaseModel) -> dict:
+    data = entity.model_dump(mode="json", exclude={"participants"})
+    if isinstance(entity, chats.Chat):
+        data["participants"] = {
+            participant.account_id: participant.model_dump(mode="json") for participant in entity.participants.values()
+        }
+    return data
+
+
+def measure(name: str, entities: list[pydantic.BaseModel], model: type[pydantic.BaseModel]) -> None:
+    print(name)
+    formats = (
+        ("json", encode_json, codec.load),
+        ("msgpack v1", codec.dump, codec.load),
+        ("msgpack fields", encode_fields, decode_fields),
+    )
+    for format_name, encode, decode in formats:
+        encoded = [encode(entity) for entity in entities]
+        assert [snapshot(decode(raw, model)) for raw in encoded] == [snapshot(entity) for entity in entities]
+        encode_time = min(timeit.repeat(lambda: [encode(entity) for entity in entities], number=1, repeat=REPEATS))
+        decode_time = min(
+            timeit.repeat(lambda: [decode(raw, model) for raw in encoded], number=1, repeat=REPEATS),
+        )
+        print(
+            f"    {format_name:<16} {sum(map(len, encoded)) / 1024:9.1f} KiB"
+            f"  encode {encode_time * 1000:8.2f} ms  decode {decode_time * 1000:8.2f} ms",
+        )
+
+
+def main() -> None:
+    for size in HISTORY_SIZES:
+        measure(
+            f"history of {size} messages",
+            [codec.load_message(raw) for raw in make_history(size)],
+            messages.Message,
+        )
+    measure(
+        f"100 chats of {CHAT_PARTICIPANTS} participants",
+        [codec.load_chat(make_chat(CHAT_PARTICIPANTS)) for _ in range(100)],
+        chats.Chat,
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,5 +1,6 @@
 import datetime
 import logging
+import typing
 import uuid
 
 import cqrs
@@ -28,12 +29,15 @@ class Chat(pydantic.BaseModel):
         description="Initiator account ID",
         frozen=True,
     )
-    participants: set[participant_entities.Participant] = pydantic.Field(default_factory=set)
+    # Participants are indexed by account ID and serialized as list
+    participants: dict[str, participant_entities.Participant] = pydantic.Field(default_factory=dict)
 
-    last_message: messages.Message | None = pydantic.Field(default=None)
+    last_message: messages.MessagePointer | None = pydantic.Field(default=None)
     last_activity_timestamp: datetime.datetime = pydantic.Field(
         default_factory=datetime.datetime.now,
     )
+    # Version of stored chat, concurrent updates are detected by it
+    version: pydantic.NonNegativeInt = pydantic.Field(default=0, exclude=True)
 
     history: list[messages.Message] = pydantic.Field(
         default_factory=list,
@@ -45,6 +49,28 @@ class Chat(pydantic.BaseModel):
         exclude=True,
     )
 
+    @pydantic.field_validator("participants", mode="before")
+    @classmethod
+    def index_participants(cls, value: typing.Any) -> typing.Any:
+        if isinstance(value, dict):
+            return value
+        return {
+            (
+                participant.account_id
+                if isinstance(participant, participant_entities.Participant)
+                else participant["account_id"]
+            ): participant
+            for participant in value
+        }
+
+    @pydantic.field_serializer("participants", mode="wrap")
+    def serialize_participants(
+        self,
+        participants: dict[str, participant_entities.Participant],
+        handler: pydantic.SerializerFunctionWrapHandler,
+    ) -> list[typing.Any]:
+        return list(handler(participants).values())
+
     @pydantic.computed_field()
     @property
     def participants_count(self) -> int:
@@ -68,7 +94,8 @@ class Chat(pydantic.BaseModel):
 
         self.history.append(message)
 
-        self.last_message = max((message, self.last_message), key=lambda x: x.created) if self.last_message else message
+        if self.last_message is None or message.created >= self.last_message.created:
+            self.last_message = message.pointer()
         self.last_activity_timestamp = message.created
 
         logger.debug(f"Message {message.message_id} added to chat {self.chat_id}")
@@ -94,7 +121,7 @@ class Chat(pydantic.BaseModel):
         participant.set_last_read_message(message)
 
         logger.debug(f"Message {message.message_id} read by {reader}")
-        read_message = messages.ReedMessage(actor=reader, message=message)
+        read_message = messages.ReedMessage(actor=reader, message=message.pointer())
         events.MessageRead(
             chat_id=message.chat_id,
             message_id=message.message_id,
@@ -110,8 +137,9 @@ class Chat(pydantic.BaseModel):
         if self.is_participant(account_id):
             return
 
-        self.participants.add(
-            participant_entities.Participant(account_id=account_id, initiated_by=initiated_by),
+        self.participants[account_id] = participant_entities.Participant(
+            account_id=account_id,
+            initiated_by=initiated_by,
         )
         logger.debug(
             f"Account {account_id} added to chat {self.chat_id} by {initiated_by}",
@@ -145,14 +173,19 @@ class Chat(pydantic.BaseModel):
         """
         Deletes chat for specified account
         """
-        if (participant := self.is_participant(account_id)) is None:
+        if self.participants.pop(account_id, None) is None:
             return
 
-        self.participants.remove(participant)
-
         logger.debug(f"Chat {self.chat_id} deleted for {account_id}")
 
-    def last_read_by(self, account_id: str) -> messages.Message | None:
+        self.event_list.append(
+            events.ChatDeleted(
+                chat_id=self.chat_id,
+                account_id=account_id,
+            ),
+        )
+
+    def last_read_by(self, account_id: str) -> messages.MessagePointer | None:
         if (participant := self.is_participant(account_id)) is None:
             return
 
@@ -162,7 +195,7 @@ class Chat(pydantic.BaseModel):
         """
         Checks if account is participant
         """
-        return next((p for p in self.participants if p.account_id == account_id), None)
+        return self.participants.get(account_id)
 
     def get_events(self) -> list[cqrs.DomainEvent]:
         """
@@ -17,6 +17,11 @@ class NewParticipantAdded(cqrs.DomainEvent, frozen=True):
     invited_by: str
 
 
+class ChatDeleted(cqrs.DomainEvent, frozen=True):
+    chat_id: pydantic.UUID4
+    account_id: str
+
+
 class MessageRead(cqrs.DomainEvent, frozen=True):
     chat_id: pydantic.UUID4
     message_id: pydantic.UUID4
@@ -18,6 +18,16 @@ TOTAL_EMOJI_NUMBER = 12
 EMOJI_PER_REACTOR = 3
 
 
+class MessagePointer(pydantic.BaseModel, frozen=True):
+    """
+    Reference to a message without its content
+    """
+
+    chat_id: pydantic.UUID4
+    message_id: pydantic.UUID4
+    created: datetime.datetime
+
+
 class Message(pydantic.BaseModel):
     """
     Message entity
@@ -46,6 +56,8 @@ class Message(pydantic.BaseModel):
     updated: datetime.datetime = pydantic.Field(
         default_factory=datetime.datetime.now,
     )
+    # Version of stored message, concurrent updates are detected by it
+    version: pydantic.NonNegativeInt = pydantic.Field(default=0, exclude=True)
 
     event_list: list[cqrs.DomainEvent] = pydantic.Field(
         default_factory=list,
@@ -171,6 +183,16 @@ class Message(pydantic.BaseModel):
             ),
         )
 
+    def pointer(self) -> MessagePointer:
+        """
+        Returns reference to the message
+        """
+        return MessagePointer(
+            chat_id=self.chat_id,
+            message_id=self.message_id,
+            created=self.created,
+        )
+
     def get_events(self) -> list[cqrs.DomainEvent]:
         """
         Returns new domain events
@@ -198,7 +220,7 @@ class ReedMessage(pydantic.BaseModel):
     """
 
     actor: str
-    message: Message
+    message: MessagePointer
     timestamp: datetime.datetime = pydantic.Field(default_factory=datetime.datetime.now)
 
     def __hash__(self):
@@ -25,10 +25,10 @@ class Participant(pydantic.BaseModel):
     first_writer: bool = False
     tags: set[ChatTag] = pydantic.Field(default_factory=set)
 
-    last_read_message: messages.Message | None = pydantic.Field(default=None)
+    last_read_message: messages.MessagePointer | None = pydantic.Field(default=None)
 
     def set_last_read_message(self, message: messages.Message):
-        self.last_read_message = message
+        self.last_read_message = message.pointer()
 
     def add_tag(self, tag: ChatTag):
         self.tags.add(tag)
@@ -14,3 +14,13 @@ class Reaction(pydantic.BaseModel, frozen=True):
         default_factory=datetime.datetime.now,
         frozen=True,
     )
+
+
+class ReactionsSummary(pydantic.BaseModel, frozen=True):
+    """
+    Counts of message reactions by emoji and emojis reacted by the reading account
+    """
+
+    message_id: pydantic.UUID4
+    counts: dict[str, pydantic.PositiveInt] = pydantic.Field(default_factory=dict)
+    reacted: frozenset[str] = pydantic.Field(default_factory=frozenset)
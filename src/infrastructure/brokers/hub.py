@@ -0,0 +1,121 @@
+import asyncio
+import logging
+import typing
+
+import redis.asyncio as redis
+from redis.asyncio import client
+
+from infrastructure.brokers import settings
+from infrastructure.database.cache.redis import connections
+
+logger = logging.getLogger(__name__)
+
+# Queue of subscriber, messages are put into it with their channels
+SubscriberQueue = asyncio.Queue[tuple[str, bytes]]
+
+
+class SubscriptionHub:
+    """
+    Pub/sub connection of the worker, shared by all its subscribers.
+    Channel is subscribed in Redis while it has local subscribers, its messages are put into their queues
+    """
+
+    def __init__(
+        self,
+        redis_factory: typing.Callable[[], redis.Redis],
+        reconnect_delay: float,
+    ):
+        self._redis_factory = redis_factory
+        self._reconnect_delay = reconnect_delay
+        self._pubsub: client.PubSub | None = None
+        self._listener: asyncio.Task | None = None
+        # Subscribers of channels. Channel is subscribed in Redis until its last subscriber leaves
+        self._channels: dict[str, set[SubscriberQueue]] = {}
+        self._subscribed: set[str] = set()
+        self._lock = asyncio.Lock()
+
+    @property
+    def pubsub(self) -> client.PubSub:
+        if self._pubsub is None:
+            self._pubsub = self._redis_factory().pubsub()
+        return self._pubsub
+
+    async def subscribe(self, channel_names: typing.Collection[str], queue: SubscriberQueue) -> None:
+        """
+        Adds queue to subscribers of channels
+        """
+        for channel_name in channel_names:
+            self._channels.setdefault(channel_name, set()).add(queue)
+        try:
+            await self._sync(channel_names)
+        except Exception:
+            for channel_name in channel_names:
+                self._discard(channel_name, queue)
+            raise
+
+    async def unsubscribe(self, channel_names: typing.Collection[str], queue: SubscriberQueue) -> None:
+        """
+        Removes queue from subscribers of channels
+        """
+        for channel_name in channel_names:
+            self._discard(channel_name, queue)
+        await self._sync(channel_names)
+
+    def _discard(self, channel_name: str, queue: SubscriberQueue) -> None:
+        queues = self._channels.get(channel_name, set())
+        queues.discard(queue)
+        if not queues:
+            self._channels.pop(channel_name, None)
+
+    async def _sync(self, channel_names: typing.Collection[str]) -> None:
+        # Commands are sent one by one, so Redis subscriptions follow the last state of local subscribers.
+        # Channels of one call are subscribed or unsubscribed with one command
+        async with self._lock:
+            to_subscribe = [
+                channel_name
+                for channel_name in dict.fromkeys(channel_names)
+                if channel_name in self._channels and channel_name not in self._subscribed
+            ]
+            to_unsubscribe = [
+                channel_name
+                for channel_name in dict.fromkeys(channel_names)
+                if channel_name not in self._channels and channel_name in self._subscribed
+            ]
+            if to_subscribe:
+                logger.debug(f"Subscribing to {', '.join(to_subscribe)}")
+                await self.pubsub.subscribe(*to_subscribe)
+                self._subscribed.update(to_subscribe)
+            if to_unsubscribe:
+                logger.debug(f"Unsubscribing from {', '.join(to_unsubscribe)}")
+                self._subscribed.difference_update(to_unsubscribe)
+                await self.pubsub.unsubscribe(*to_unsubscribe)
+
+            if self._subscribed and (self._listener is None or self._listener.done()):
+                self._listener = asyncio.create_task(self._listen())
+
+    async def _listen(self) -> None:
+        # Pub/sub connection resubscribes to its channels on reconnect
+        while self._subscribed:
+            try:
+                message = await self.pubsub.get_message(ignore_subscribe_messages=True, timeout=None)
+            except Exception as error:
+                logger.error(f"Listening to subscriptions failed: {error}")
+                await asyncio.sleep(self._reconnect_delay)
+                continue
+            if message is not None and message["type"] == "message":
+                self._dispatch(message["channel"], message["data"])
+
+    def _dispatch(self, channel: str | bytes, data: str | bytes) -> None:
+        channel_name = channel.decode() if isinstance(channel, bytes) else channel
+        event = data.encode() if isinstance(data, str) else data
+        for queue in self._channels.get(channel_name, ()):
+            try:
+                queue.put_nowait((channel_name, event))
+            except asyncio.QueueFull:
+                logger.warning(f"Subscriber of {channel_name} is too slow, event is dropped")
+
+
+subscription_hub = SubscriptionHub(
+    redis_factory=connections.RedisConnectionFactory(),
+    reconnect_delay=settings.subscription_hub_settings.RECONNECT_DELAY_SECONDS,
+)
@@ -1,4 +1,5 @@
 import abc
+import typing
 
 
 class MessageBroker(abc.ABC):
@@ -11,13 +12,17 @@ class MessageBroker(abc.ABC):
         raise NotImplementedError
 
     @abc.abstractmethod
-    async def get_message(self) -> bytes | None:
+    def listen(self) -> typing.AsyncIterator[bytes]:
         raise NotImplementedError
 
     @abc.abstractmethod
     async def subscribe(self, channel_name: str) -> None:
         raise NotImplementedError
 
+    @abc.abstractmethod
+    async def subscribe_many(self, *channel_names: str) -> None:
+        raise NotImplementedError
+
     @abc.abstractmethod
     async def unsubscribe(self, channel_name: str) -> None:
         raise NotImplementedError
@@ -1,11 +1,10 @@
+import asyncio
 import logging
 import typing
 
-import pydantic
 import redis.asyncio as redis
-from redis.asyncio import client
 
-from infrastructure.brokers import messages_broker
+from infrastructure.brokers import hub as subscription_hub, messages_broker, settings
 
 logger = logging.getLogger(__name__)
 
@@ -14,59 +13,59 @@ class RedisMessageBroker(messages_broker.MessageBroker):
     def __init__(
         self,
         redis_factory: typing.Callable[[], redis.Redis],
-        timeout_ms: pydantic.PositiveInt = 500,
+        hub: subscription_hub.SubscriptionHub = subscription_hub.subscription_hub,
     ):
         self.connect = redis_factory()
 
-        self.pubsub: client.PubSub | None = None
-        self.timeout = float(timeout_ms) / 1000
+        # Subscriptions are served by pub/sub connection of the worker, events of them are put into the queue
+        self.hub = hub
+        self.queue: subscription_hub.SubscriberQueue | None = None
         self.subscribed_channels = set()
 
     async def start(self) -> None:
-        self.pubsub = self.connect.pubsub()
+        self.queue = asyncio.Queue(maxsize=settings.subscription_hub_settings.QUEUE_SIZE)
 
     async def send_message(self, channel_name: str, message: bytes) -> None:
         logger.debug(f"Sending new message {message} to {channel_name}")
         await self.connect.publish(channel_name, message)
 
-    async def get_message(self) -> bytes | None:
-        if self.pubsub is None or not self.pubsub.subscribed:
+    async def listen(self) -> typing.AsyncIterator[bytes]:
+        if self.queue is None or not self.subscribed_channels:
             raise Exception("Not subscribed")
 
-        message = await self.pubsub.get_message(
-            ignore_subscribe_messages=True,
-            timeout=self.timeout,
-        )
-
-        if message is None:
-            return
-
-        if message["type"] != "message":
-            return
-
-        return message.get("data")
+        queue = self.queue
+        while True:
+            channel_name, message = await queue.get()
+            # Messages of channel could be queued before unsubscribing from it
+            if channel_name in self.subscribed_channels:
+                yield message
 
     async def subscribe(self, channel_name: str) -> None:
-        if self.pubsub is None:
+        await self.subscribe_many(channel_name)
+
+    async def subscribe_many(self, *channel_names: str) -> None:
+        if self.queue is None:
             raise Exception("Broker not started")
+        if not channel_names:
+            return
 
-        logger.debug(f"Subscribing to {channel_name}")
-        await self.pubsub.subscribe(channel_name)
-        self.subscribed_channels.add(channel_name)
+        await self.hub.subscribe(channel_names, self.queue)
+        self.subscribed_channels.update(channel_names)
 
     async def unsubscribe(self, channel_name: str) -> None:
-        if self.pubsub is None or not self.pubsub.subscribed:
+        if self.queue is None:
             raise Exception("Broker not started")
+        # Channel could be left already, e.g. chat is deleted twice
+        if channel_name not in self.subscribed_channels:
+            return
 
-        logger.debug(f"Unsubscribing from {channel_name}")
-        await self.pubsub.unsubscribe(channel_name)
-        self.subscribed_channels.remove(channel_name)
+        self.subscribed_channels.discard(channel_name)
+        await self.hub.unsubscribe([channel_name], self.queue)
 
     async def stop(self) -> None:
-        if self.pubsub is None or not self.pubsub.subscribed:
+        if self.queue is None or not self.subscribed_channels:
             raise Exception("Broker not started")
 
-        while self.subscribed_channels:
-            channel_name = self.subscribed_channels.pop()
-            await self.pubsub.unsubscribe(channel_name)
-        await self.pubsub.aclose()
+        channel_names, self.subscribed_channels = self.subscribed_channels, set()
+        await self.hub.unsubscribe(channel_names, self.queue)
+        self.queue = None
@@ -0,0 +1,18 @@
+import dotenv
+import pydantic
+import pydantic_settings
+
+dotenv.load_dotenv()
+
+
+class SubscriptionHubSettings(pydantic_settings.BaseSettings, case_sensitive=True):
+    # Events of subscriber, which are not consumed yet. Events over limit are dropped
+    QUEUE_SIZE: pydantic.PositiveInt = pydantic.Field(default=1_000)
+    RECONNECT_DELAY_SECONDS: pydantic.PositiveFloat = pydantic.Field(default=1)
+    # Chat events are published once to channel of chat instead of channels of all participants
+    CHAT_CHANNELS: bool = pydantic.Field(default=False)
+
+    model_config = pydantic_settings.SettingsConfigDict(env_prefix="SUBSCRIPTION_HUB_")
+
+
+subscription_hub_settings = SubscriptionHubSettings()
@@ -0,0 +1,120 @@
+import collections
+import time
+import typing
+import uuid
+
+from domain import chats
+from infrastructure.database.cache.memory import settings, subscription
+
+CHAT_INVALIDATIONS_CHANNEL = "chat_invalidations"
+
+
+class CachedChat(typing.NamedTuple):
+    """
+    Decoded chat value. Chat state is not cached, it changes with every message
+    """
+
+    value: bytes
+    chat: chats.Chat
+    chat_version: int
+    expires_at: float
+
+
+def copy_chat(chat: chats.Chat) -> chats.Chat:
+    """
+    Returns copy of chat, that can be changed without changing the cached one.
+    Copy is about twice cheaper than decoding of chat value
+    """
+    return chat.model_copy(
+        update={
+            "participants": {
+                account_id: participant.model_copy(update={"tags": set(participant.tags)})
+                for account_id, participant in chat.participants.items()
+            },
+            "history": [],
+            "event_list": [],
+        },
+    )
+
+
+class ChatCache(subscription.SubscribedCache):
+    """
+    LRU cache of decoded chat values of the worker, invalidated by changes of chats in all workers
+    """
+
+    channel = CHAT_INVALIDATIONS_CHANNEL
+
+    def __init__(self, max_size: int, ttl_seconds: float):
+        super().__init__(enabled=max_size > 0)
+        self._max_size = max_size
+        self._ttl_seconds = ttl_seconds
+        self._entries: collections.OrderedDict[uuid.UUID, CachedChat] = collections.OrderedDict()
+        # Incremented by every invalidation, so values read before invalidation are not cached
+        self._version = 0
+
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._evictions = 0
+
+    @property
+    def version(self) -> int:
+        return self._version
+
+    def get(self, chat_id: uuid.UUID) -> CachedChat | None:
+        entry = self._entries.get(chat_id) if self.serving else None
+        if entry is not None and entry.expires_at < time.monotonic():
+            del self._entries[chat_id]
+            entry = None
+        if entry is None:
+            self._misses += 1
+            return None
+
+        self._entries.move_to_end(chat_id)
+        self._hits += 1
+        return entry
+
+    def put(self, chat_id: uuid.UUID, value: bytes, chat: chats.Chat, chat_version: int, cache_version: int) -> None:
+        """
+        Caches chat value read when cache had specified version
+        """
+        if not self.serving or cache_version != self._version:
+            return
+
+        self._entries[chat_id] = CachedChat(
+            value=value,
+            chat=chat,
+            chat_version=chat_version,
+            expires_at=time.monotonic() + self._ttl_seconds,
+        )
+        self._entries.move_to_end(chat_id)
+        while len(self._entries) > self._max_size:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def on_message(self, data: bytes) -> None:
+        self.invalidate(uuid.UUID(data.decode()))
+
+    def invalidate(self, chat_id: uuid.UUID) -> None:
+        self._version += 1
+        if self._entries.pop(chat_id, None) is not None:
+            self._invalidations += 1
+
+    def clear(self) -> None:
+        self._version += 1
+        self._entries.clear()
+
+    def stats(self) -> subscription.CacheStats:
+        return subscription.CacheStats(
+            size=len(self._entries),
+            hits=self._hits,
+            misses=self._misses,
+            invalidations=self._invalidations,
+            evictions=self._evictions,
+        )
+
+
+chat_cache = ChatCache(
+    max_size=settings.chat_cache_settings.MAX_SIZE,
+    ttl_seconds=settings.chat_cache_settings.TTL_SECONDS,
+)
@@ -0,0 +1,186 @@
+import bisect
+import collections
+import typing
+import uuid
+
+from domain import messages
+from infrastructure.database.cache.memory import settings, subscription
+from infrastructure.database.persistent import codec
+
+RECENT_MESSAGES_CHANNEL = "chat_messages"
+
+
+def message_event(chat_id: uuid.UUID, value: bytes) -> bytes:
+    """
+    Returns channel message about added or changed message of chat with its encoded value
+    """
+    return chat_id.bytes + value
+
+
+def history_order(message: messages.Message) -> tuple[float, str]:
+    # Same order as in chat history sorted set: by score, then by member
+    return message.created.timestamp(), str(message.message_id)
+
+
+class RecentMessages:
+    """
+    Latest messages of chat in order of chat history, from the oldest one
+    """
+
+    def __init__(self, limit: int, complete: bool):
+        self.limit = limit
+        # Whole chat history is in buffer, so any page of it can be served
+        self.complete = complete
+        self.messages: list[messages.Message] = []
+        self.sizes: dict[uuid.UUID, int] = {}
+        self.size = 0
+
+    def upsert(self, message: messages.Message, size: int) -> int:
+        """
+        Puts added or changed message into buffer. Returns change of buffer size in bytes
+        """
+        initial_size = self.size
+        if message.message_id in self.sizes:
+            index = next(
+                index for index, buffered in enumerate(self.messages) if buffered.message_id == message.message_id
+            )
+            self.messages[index] = message
+        elif self.complete or (self.messages and history_order(message) > history_order(self.messages[0])):
+            bisect.insort(self.messages, message, key=history_order)
+        else:
+            return 0
+
+        self.size += size - self.sizes.get(message.message_id, 0)
+        self.sizes[message.message_id] = size
+        while len(self.messages) > self.limit:
+            self.size -= self.sizes.pop(self.messages.pop(0).message_id)
+            self.complete = False
+        return self.size - initial_size
+
+    def page(self, limit: int, reverse: bool) -> list[messages.Message] | None:
+        """
+        Returns copies of first page of chat history in order of chat repository, if buffer has it
+        """
+        if reverse:
+            selected = self.messages[:limit] if self.complete else None
+        else:
+            selected = self.messages[::-1][:limit] if self.complete or len(self.messages) >= limit else None
+        if selected is None:
+            return None
+        return [message.model_copy() for message in selected]
+
+
+class RecentMessagesCache(subscription.SubscribedCache):
+    """
+    Ring buffers of recent messages of active chats of the worker, fed by added and changed messages of all workers.
+    Buffers are evicted by LRU over chats within budget of encoded messages size
+    """
+
+    channel = RECENT_MESSAGES_CHANNEL
+
+    def __init__(self, per_chat: int, max_bytes: int):
+        super().__init__(enabled=per_chat > 0 and max_bytes > 0)
+        self._per_chat = per_chat
+        self._max_bytes = max_bytes
+        self._entries: collections.OrderedDict[uuid.UUID, RecentMessages] = collections.OrderedDict()
+        self._size = 0
+        # Messages of chats, received while their latest messages are loaded from storage
+        self._watched: dict[uuid.UUID, list[list[bytes]]] = {}
+
+        self._hits = 0
+        self._misses = 0
+        self._invalidations = 0
+        self._evictions = 0
+
+    async def get_page(
+        self,
+        chat_id: uuid.UUID,
+        limit: int,
+        reverse: bool,
+        load_latest: typing.Callable[[int], typing.Awaitable[list[bytes | None]]],
+    ) -> list[messages.Message] | None:
+        """
+        Returns first page of chat history, loading latest messages of chat on miss.
+        Pages that are not in buffer are not returned
+        """
+        if not self.serving or not 0 < limit <= self._per_chat:
+            return None
+
+        recent = self._entries.get(chat_id)
+        page = recent.page(limit, reverse) if recent is not None else None
+        if page is not None:
+            self._entries.move_to_end(chat_id)
+            self._hits += 1
+            return page
+
+        self._misses += 1
+        if recent is not None:
+            return None
+        events: list[bytes] = []
+        self._watched.setdefault(chat_id, []).append(events)
+        try:
+            values = await load_latest(self._per_chat)
+            recent = self._put(chat_id, values, events)
+        finally:
+            self._unwatch(chat_id, events)
+        return recent.page(limit, reverse)
+
+    def _unwatch(self, chat_id: uuid.UUID, events: list[bytes]) -> None:
+        watchers = [watcher for watcher in self._watched.get(chat_id, []) if watcher is not events]
+        if watchers:
+            self._watched[chat_id] = watchers
+        else:
+            self._watched.pop(chat_id, None)
+
+    def _put(self, chat_id: uuid.UUID, values: list[bytes | None], events: list[bytes]) -> RecentMessages:
+        # It is not known whether messages received while loading were loaded, so they are applied once more
+        recent = RecentMessages(self._per_chat, complete=True)
+        for value in values:
+            if value:
+                recent.upsert(codec.load_message(value), len(value))
+        recent.complete = len(values) < self._per_chat
+        for value in events:
+            recent.upsert(codec.load_message(value), len(value))
+
+        # Messages could be missed, if cache was cleared while loading
+        if self.serving and any(watcher is events for watcher in self._watched.get(chat_id, [])):
+            if (replaced := self._entries.pop(chat_id, None)) is not None:
+                self._size -= replaced.size
+            self._entries[chat_id] = recent
+            self._size += recent.size
+            self._evict()
+        return recent
+
+    def _evict(self) -> None:
+        while self._size > self._max_bytes and self._entries:
+            self._size -= self._entries.popitem(last=False)[1].size
+            self._evictions += 1
+
+    def on_message(self, data: bytes) -> None:
+        chat_id, value = uuid.UUID(bytes=data[:16]), data[16:]
+        for events in self._watched.get(chat_id, []):
+            events.append(value)
+        if (recent := self._entries.get(chat_id)) is not None:
+            self._size += recent.upsert(codec.load_message(value), len(value))
+            self._invalidations += 1
+            self._evict()
+
+    def clear(self) -> None:
+        self._entries.clear()
+        self._watched.clear()
+        self._size = 0
+
+    def stats(self) -> subscription.CacheStats:
+        return subscription.CacheStats(
+            size=len(self._entries),
+            hits=self._hits,
+            misses=self._misses,
+            invalidations=self._invalidations,
+            evictions=self._evictions,
+        )
+
+
+recent_messages_cache = RecentMessagesCache(
+    per_chat=settings.recent_messages_settings.PER_CHAT,
+    max_bytes=settings.recent_messages_settings.MAX_BYTES,
+)
@@ -0,0 +1,26 @@
+import dotenv
+import pydantic
+import pydantic_settings
+
+dotenv.load_dotenv()
+
+
+class ChatCacheSettings(pydantic_settings.BaseSettings, case_sensitive=True):
+    MAX_SIZE: pydantic.NonNegativeInt = pydantic.Field(default=10_000)
+    TTL_SECONDS: pydantic.PositiveFloat = pydantic.Field(default=60)
+
+    model_config = pydantic_settings.SettingsConfigDict(env_prefix="CHAT_CACHE_")
+
+
+chat_cache_settings = ChatCacheSettings()
+
+
+class RecentMessagesSettings(pydantic_settings.BaseSettings, case_sensitive=True):
+    PER_CHAT: pydantic.NonNegativeInt = pydantic.Field(default=50)
+    # Budget of encoded values of cached messages in all chats
+    MAX_BYTES: pydantic.NonNegativeInt = pydantic.Field(default=64 * 1024 * 1024)
+
+    model_config = pydantic_settings.SettingsConfigDict(env_prefix="RECENT_MESSAGES_")
+
+
+recent_messages_settings = RecentMessagesSettings()
@@ -0,0 +1,71 @@
+import abc
+import asyncio
+import logging
+import typing
+
+import redis.asyncio as redis
+
+logger = logging.getLogger(__name__)
+
+
+class CacheStats(typing.NamedTuple):
+    size: int
+    hits: int
+    misses: int
+    # Entries dropped or changed by channel messages
+    invalidations: int
+    evictions: int
+
+
+class SubscribedCache(abc.ABC):
+    """
+    Worker cache, kept up to date by messages of pub/sub channel.
+    Entries are served only while cache is subscribed, because missed messages are not known
+    """
+
+    channel: typing.ClassVar[str]
+
+    def __init__(self, enabled: bool):
+        self._enabled = enabled
+        self._listener: asyncio.Task | None = None
+        self._listening = False
+
+    @property
+    def serving(self) -> bool:
+        return self._enabled and self._listening
+
+    @abc.abstractmethod
+    def on_message(self, data: bytes) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def clear(self) -> None:
+        raise NotImplementedError
+
+    @abc.abstractmethod
+    def stats(self) -> CacheStats:
+        raise NotImplementedError
+
+    def start(self, redis_factory: typing.Callable[[], redis.Redis]) -> None:
+        """
+        Starts listening to channel, if it is not started yet
+        """
+        if self._enabled and (self._listener is None or self._listener.done()):
+            self._listener = asyncio.create_task(self._listen(redis_factory))
+
+    async def _listen(self, redis_factory: typing.Callable[[], redis.Redis]) -> None:
+        pubsub = redis_factory().pubsub()
+        try:
+            await pubsub.subscribe(self.channel)
+            async for message in pubsub.listen():
+                if message["type"] == "subscribe":
+                    self._listening = True
+                elif message["type"] == "message":
+                    data = message["data"]
+                    self.on_message(data.encode() if isinstance(data, str) else data)
+        except Exception as error:
+            logger.error(f"Listening to {self.channel} failed: {error}")
+        finally:
+            self._listening = False
+            self.clear()
+            await pubsub.aclose()
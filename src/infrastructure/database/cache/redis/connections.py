@@ -6,3 +6,8 @@ from infrastructure.database.cache.redis import pools
 class RedisConnectionFactory:
     def __call__(self) -> redis.Redis:
         return redis.Redis(connection_pool=pools.connection_pool)
+
+
+class RedisBinaryConnectionFactory:
+    def __call__(self) -> redis.Redis:
+        return redis.Redis(connection_pool=pools.binary_connection_pool)
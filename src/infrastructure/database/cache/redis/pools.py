@@ -6,3 +6,8 @@ connection_pool = redis.ConnectionPool.from_url(
     settings.redis_settings.dsn(),
     decode_responses=True,
 )
+# Storage values are encoded in binary format, so responses of this pool are not decoded
+binary_connection_pool = redis.ConnectionPool.from_url(
+    settings.redis_settings.dsn(),
+    decode_responses=False,
+)
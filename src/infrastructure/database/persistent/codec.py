@@ -0,0 +1,111 @@
+import datetime
+import functools
+import typing
+import uuid
+
+import msgpack
+import orjson
+import pydantic
+
+from domain import attachments, chats, messages, reactions
+
+Entity = typing.TypeVar("Entity", bound=pydantic.BaseModel)
+
+# Every encoded value starts with the version byte. Values without it are legacy JSON documents
+MSGPACK_V1 = 1
+CURRENT_VERSION = MSGPACK_V1
+LEGACY_JSON_MARKER = ord("{")
+
+
+@functools.cache
+def _model_collection_fields(model: type[pydantic.BaseModel]) -> frozenset[str]:
+    return frozenset(
+        name
+        for name, field in model.model_fields.items()
+        if typing.get_origin(field.annotation) in (set, dict)
+        and isinstance(item_type := typing.get_args(field.annotation)[-1], type)
+        and issubclass(item_type, pydantic.BaseModel)
+    )
+
+
+def _to_python(
+    entity: pydantic.BaseModel,
+    exclude: typing.Mapping[str, typing.Any] | None = None,
+) -> dict[str, typing.Any]:
+    # Pydantic can not dump sets of models in python mode, so collections of models are dumped item by item.
+    # They are stored as lists, indexed collections are rebuilt by model validation
+    exclude = exclude or {}
+    model_collection_fields = _model_collection_fields(type(entity))
+    data = entity.model_dump(
+        mode="python",
+        exclude={
+            **dict.fromkeys([*model_collection_fields, *type(entity).model_computed_fields], True),
+            **{name: nested for name, nested in exclude.items() if name not in model_collection_fields},
+        },
+    )
+    for name in model_collection_fields:
+        nested = exclude.get(name)
+        if nested is True:
+            continue
+        items = getattr(entity, name)
+        dumped = [
+            _to_python(item, (nested or {}).get("__all__"))
+            for item in (items.values() if isinstance(items, dict) else items)
+        ]
+        # Order of set items depends on hash seed of the process, so sets are sorted to encode equal values equally
+        data[name] = sorted(dumped, key=repr) if isinstance(items, (set, frozenset)) else dumped
+    return data
+
+
+def _pack(value: typing.Any) -> typing.Any:
+    # UUIDs are stored as raw bytes and parsed back by pydantic validation
+    if isinstance(value, uuid.UUID):
+        return value.bytes
+    if isinstance(value, datetime.datetime):
+        return value.isoformat()
+    raise TypeError(f"Can not encode {type(value).__name__}")
+
+
+def dump(entity: pydantic.BaseModel, exclude: typing.Mapping[str, typing.Any] | None = None) -> bytes:
+    """
+    Encodes entity with current version of storage format.
+    Excluded fields are set in pydantic format, with `__all__` key for items of collections
+    """
+    return bytes((CURRENT_VERSION,)) + msgpack.packb(  # pyright: ignore[reportOperatorIssue]
+        _to_python(entity, exclude),
+        default=_pack,
+    )
+
+
+def load(raw: str | bytes, model: type[Entity]) -> Entity:
+    """
+    Decodes entity of any known version of storage format
+    """
+    if isinstance(raw, str) or raw[0] == LEGACY_JSON_MARKER:
+        return model.model_validate(orjson.loads(raw))
+    if raw[0] == MSGPACK_V1:
+        return model.model_validate(msgpack.unpackb(raw[1:]))
+    raise ValueError(f"Unknown storage format version {raw[0]}")
+
+
+def load_message(raw: str | bytes) -> messages.Message:
+    return load(raw, messages.Message)
+
+
+def load_chat(raw: str | bytes) -> chats.Chat:
+    return load(raw, chats.Chat)
+
+
+def load_attachment(raw: str | bytes) -> attachments.Attachment:
+    return load(raw, attachments.Attachment)
+
+
+def load_reaction(raw: str | bytes) -> reactions.Reaction:
+    return load(raw, reactions.Reaction)
+
+
+def as_str(value: object) -> str:
+    """
+    Returns storage value or identifier as string, whether connection decodes responses or not
+    """
+    return value.decode() if isinstance(value, bytes) else str(value)
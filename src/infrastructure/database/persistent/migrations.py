@@ -0,0 +1,312 @@
+import asyncio
+import collections
+import logging
+import typing
+
+import orjson
+import redis.asyncio as redis
+
+from domain import attachments, chats, messages
+from infrastructure.database.cache.redis import connections
+from infrastructure.database.persistent import codec, mock
+
+logger = logging.getLogger(__name__)
+
+LEGACY_CHAT_HISTORY_PREFIX = "chat_history_{}"
+LEGACY_READ_MESSAGES_PREFIX = "read_messages_{chat_id}_{participant_id}"
+LEGACY_PARTICIPANT_CHATS_PREFIX = "participant_chats_{}"
+LEGACY_CHAT_ATTACHMENTS_PREFIX = "chat_attachments_{}"
+
+
+async def migrate_chat_history_index(connect: redis.Redis) -> None:
+    """
+    Moves legacy chat history lists into sorted sets scored by message creation time
+    """
+    async for history_key in connect.scan_iter(match=LEGACY_CHAT_HISTORY_PREFIX.format("*"), _type="list"):
+        chat_id = codec.as_str(history_key).removeprefix(LEGACY_CHAT_HISTORY_PREFIX.format(""))
+        message_ids = await connect.lrange(history_key, 0, -1)  # pyright: ignore[reportGeneralTypeIssues]
+        if message_ids:
+            messages_bytes = await connect.mget(
+                *[mock.MESSAGES_PREFIX.format(codec.as_str(message_id)) for message_id in message_ids],
+            )
+            scores = {
+                message_id: mock.history_score(codec.load_message(message_bytes))
+                for message_id, message_bytes in zip(message_ids, messages_bytes)
+                if message_bytes
+            }
+            if scores:
+                await connect.zadd(mock.CHAT_HISTORY_PREFIX.format(chat_id), scores)
+        await connect.delete(history_key)
+        logger.info(f"Chat {chat_id} history moved into sorted set")
+
+
+async def migrate_read_pointers(connect: redis.Redis) -> None:
+    """
+    Collapses legacy lists of read messages into read pointers
+    """
+    set_read_pointer = connect.register_script(mock.SET_READ_POINTER_SCRIPT)
+    async for read_messages_key in connect.scan_iter(
+        match=LEGACY_READ_MESSAGES_PREFIX.format(chat_id="*", participant_id="*"),
+        _type="list",
+    ):
+        read_messages_bytes = await connect.lrange(read_messages_key, 0, -1)  # pyright: ignore[reportGeneralTypeIssues]
+        if read_messages_bytes:
+            last_read = max(
+                (messages.ReedMessage.model_validate(orjson.loads(read_bytes)) for read_bytes in read_messages_bytes),
+                key=lambda read_message: read_message.timestamp,
+            )
+            await set_read_pointer(
+                keys=[
+                    mock.CHAT_HISTORY_PREFIX.format(last_read.message.chat_id),
+                    mock.READ_POINTER_PREFIX.format(
+                        chat_id=last_read.message.chat_id,
+                        participant_id=last_read.actor,
+                    ),
+                ],
+                args=[str(last_read.message.message_id), last_read.message.created.isoformat()],
+            )
+        await connect.delete(read_messages_key)
+        logger.info(f"Read messages list {codec.as_str(read_messages_key)} collapsed into read pointer")
+
+
+async def migrate_participant_chats_index(connect: redis.Redis) -> None:
+    """
+    Moves legacy lists of participant chats into sorted sets scored by chat last activity
+    """
+    async for participant_chats_key in connect.scan_iter(
+        match=LEGACY_PARTICIPANT_CHATS_PREFIX.format("*"),
+        _type="list",
+    ):
+        participant = codec.as_str(participant_chats_key).removeprefix(LEGACY_PARTICIPANT_CHATS_PREFIX.format(""))
+        chat_ids = await connect.lrange(participant_chats_key, 0, -1)  # pyright: ignore[reportGeneralTypeIssues]
+        if chat_ids:
+            chats_bytes = await connect.mget(*[mock.CHATS_PREFIX.format(codec.as_str(chat_id)) for chat_id in chat_ids])
+            scores = {}
+            for chat_bytes in chats_bytes:
+                if not chat_bytes:
+                    continue
+                chat = codec.load_chat(chat_bytes)
+                if chat.is_participant(participant):
+                    scores[str(chat.chat_id)] = mock.activity_score(chat)
+            if scores:
+                await connect.zadd(mock.PARTICIPANT_CHATS_PREFIX.format(participant), scores)
+        await connect.delete(participant_chats_key)
+        logger.info(f"Chats of {participant} moved into sorted set")
+
+
+async def migrate_participants_set_index(connect: redis.Redis) -> None:
+    """
+    Indexes existing chats by their participants set
+    """
+    async for chat_key in connect.scan_iter(match=mock.CHATS_PREFIX.format("*"), _type="string"):
+        chat_bytes = await connect.get(chat_key)
+        if not chat_bytes:
+            continue
+        chat = codec.load_chat(chat_bytes)
+        if not chat.participants:
+            continue
+        await connect.sadd(  # pyright: ignore[reportGeneralTypeIssues]
+            mock.PARTICIPANTS_SET_CHATS_PREFIX.format(
+                mock.participants_set_hash(participant.account_id for participant in chat.participants.values()),
+            ),
+            str(chat.chat_id),
+        )
+        logger.info(f"Chat {chat.chat_id} indexed by participants set")
+
+
+async def migrate_chat_attachments_index(connect: redis.Redis) -> None:
+    """
+    Moves legacy lists of chat attachments into sorted sets per attachment type and status
+    """
+    async for chat_attachments_key in connect.scan_iter(
+        match=LEGACY_CHAT_ATTACHMENTS_PREFIX.format("*"),
+        _type="list",
+    ):
+        attachment_ids = await connect.lrange(chat_attachments_key, 0, -1)  # pyright: ignore[reportGeneralTypeIssues]
+        if attachment_ids:
+            attachments_bytes = await connect.mget(
+                *[mock.ATTACHMENTS_PREFIX.format(codec.as_str(attachment_id)) for attachment_id in attachment_ids],
+            )
+            async with connect.pipeline(transaction=True) as pipeline:
+                for attachment_bytes in attachments_bytes:
+                    if attachment_bytes:
+                        await mock.index_attachment(pipeline, codec.load_attachment(attachment_bytes))
+                await pipeline.delete(chat_attachments_key)
+                await pipeline.execute()
+        else:
+            await connect.delete(chat_attachments_key)
+        logger.info(f"Attachments list {codec.as_str(chat_attachments_key)} moved into sorted sets")
+
+
+async def migrate_values_encoding(connect: redis.Redis) -> None:
+    """
+    Re-encodes legacy JSON values of messages, chats and attachments into current storage format
+    """
+    for prefix, model in (
+        (mock.MESSAGES_PREFIX, messages.Message),
+        (mock.CHATS_PREFIX, chats.Chat),
+        (mock.ATTACHMENTS_PREFIX, attachments.Attachment),
+    ):
+        async for key in connect.scan_iter(match=prefix.format("*"), _type="string"):
+            raw = await connect.get(key)
+            if not raw or raw[0] != codec.LEGACY_JSON_MARKER:
+                continue
+            await connect.set(key, codec.dump(codec.load(raw, model)))
+            logger.info(f"Value {codec.as_str(key)} re-encoded")
+
+
+async def migrate_chat_message_pointers(connect: redis.Redis) -> None:
+    """
+    Rewrites chats with embedded copies of last messages and last read messages to message pointers
+    """
+    async for chat_key in connect.scan_iter(match=mock.CHATS_PREFIX.format("*"), _type="string"):
+        chat_bytes = await connect.get(chat_key)
+        if not chat_bytes:
+            continue
+        chat_pointers_bytes = codec.dump(codec.load_chat(chat_bytes))
+        if len(chat_pointers_bytes) < len(chat_bytes):
+            await connect.set(chat_key, chat_pointers_bytes)
+            logger.info(f"Chat {codec.as_str(chat_key)} rewritten with message pointers")
+
+
+async def migrate_chat_state(connect: redis.Redis) -> None:
+    """
+    Moves last message, last activity and last read messages of chats into chat state hashes
+    """
+    async for chat_key in connect.scan_iter(match=mock.CHATS_PREFIX.format("*"), _type="string"):
+        chat_id = codec.as_str(chat_key).removeprefix(mock.CHATS_PREFIX.format(""))
+        chat_state_key = mock.CHAT_STATE_PREFIX.format(chat_id)
+        if await connect.exists(chat_state_key):
+            continue
+        chat_bytes = await connect.get(chat_key)
+        if not chat_bytes:
+            continue
+        chat = codec.load_chat(chat_bytes)
+        async with connect.pipeline(transaction=True) as pipeline:
+            await pipeline.hset(chat_state_key, mapping=mock.chat_state(chat))  # pyright: ignore[reportGeneralTypeIssues, reportArgumentType]
+            await pipeline.set(chat_key, codec.dump(chat, exclude=mock.CHAT_STATE_FIELDS))
+            await pipeline.execute()
+        logger.info(f"Chat {chat_id} state moved into chat state hash")
+
+
+async def migrate_chat_members(connect: redis.Redis) -> None:
+    """
+    Collects participants and first writers of chats into chat members sets
+    """
+    async for chat_key in connect.scan_iter(match=mock.CHATS_PREFIX.format("*"), _type="string"):
+        chat_bytes = await connect.get(chat_key)
+        if not chat_bytes:
+            continue
+        chat = codec.load_chat(chat_bytes)
+        async with connect.pipeline(transaction=True) as pipeline:
+            for members_key, member_ids in (
+                (mock.CHAT_MEMBERS_PREFIX, {participant.account_id for participant in chat.participants.values()}),
+                (mock.CHAT_FIRST_WRITERS_PREFIX, mock.first_writer_ids(chat)),
+            ):
+                await pipeline.delete(members_key.format(chat.chat_id))
+                if member_ids:
+                    await pipeline.sadd(members_key.format(chat.chat_id), *member_ids)  # pyright: ignore[reportGeneralTypeIssues]
+            await pipeline.execute()
+        logger.info(f"Chat {chat.chat_id} members collected into sets")
+
+
+async def migrate_message_reactions(connect: redis.Redis) -> None:
+    """
+    Moves reactions of messages into message reactions hashes and reactors sorted sets
+    """
+    async for message_key in connect.scan_iter(match=mock.MESSAGES_PREFIX.format("*"), _type="string"):
+        message_bytes = await connect.get(message_key)
+        if not message_bytes:
+            continue
+        message = codec.load_message(message_bytes)
+        if not message.reactions:
+            continue
+        async with connect.pipeline(transaction=True) as pipeline:
+            for reaction in message.reactions:
+                await pipeline.hset(  # pyright: ignore[reportGeneralTypeIssues]
+                    mock.MESSAGE_REACTIONS_PREFIX.format(message.message_id),
+                    mock.reaction_field(reaction),
+                    codec.dump(reaction),  # pyright: ignore[reportArgumentType]
+                )
+                await pipeline.zadd(
+                    mock.MESSAGE_REACTORS_PREFIX.format(message_id=message.message_id, emoji=reaction.emoji),
+                    {reaction.reactor: reaction.created.timestamp()},
+                )
+            await pipeline.set(message_key, mock.dump_message(message))
+            await pipeline.execute()
+        logger.info(f"Message {message.message_id} reactions moved into reactions hash")
+
+
+async def migrate_reactions_summary(connect: redis.Redis) -> None:
+    """
+    Counts reactions of messages by emoji and collects emojis of every reactor
+    """
+    async for reactions_key in connect.scan_iter(match=mock.MESSAGE_REACTIONS_PREFIX.format("*"), _type="hash"):
+        message_id = codec.as_str(reactions_key).removeprefix(mock.MESSAGE_REACTIONS_PREFIX.format(""))
+        message_reactions = [
+            codec.load_reaction(reaction_bytes)
+            for reaction_bytes in await connect.hvals(reactions_key)  # pyright: ignore[reportGeneralTypeIssues]
+        ]
+        counts = collections.Counter(reaction.emoji for reaction in message_reactions)
+        reactor_emojis = collections.defaultdict(set)
+        for reaction in message_reactions:
+            reactor_emojis[reaction.reactor].add(reaction.emoji)
+
+        counts_key = mock.MESSAGE_REACTION_COUNTS_PREFIX.format(message_id)
+        async with connect.pipeline(transaction=True) as pipeline:
+            await pipeline.delete(counts_key)
+            if counts:
+                await pipeline.hset(counts_key, mapping=counts)  # pyright: ignore[reportGeneralTypeIssues, reportArgumentType]
+            for reactor, emojis in reactor_emojis.items():
+                emojis_key = mock.MESSAGE_REACTOR_EMOJIS_PREFIX.format(message_id=message_id, reactor=reactor)
+                await pipeline.delete(emojis_key)
+                await pipeline.sadd(emojis_key, *emojis)  # pyright: ignore[reportGeneralTypeIssues]
+            await pipeline.execute()
+        logger.info(f"Message {message_id} reactions summarized")
+
+
+async def migrate_chat_state_last_message_score(connect: redis.Redis) -> None:
+    """
+    Sets history scores of last messages in chat state hashes
+    """
+    async for chat_state_key in connect.scan_iter(match=mock.CHAT_STATE_PREFIX.format("*"), _type="hash"):
+        last_message_bytes = await connect.hget(chat_state_key, mock.CHAT_STATE_LAST_MESSAGE)  # pyright: ignore[reportGeneralTypeIssues]
+        if not last_message_bytes:
+            continue
+        last_message = codec.load(last_message_bytes, messages.MessagePointer)
+        if await connect.hsetnx(  # pyright: ignore[reportGeneralTypeIssues]
+            chat_state_key,
+            mock.CHAT_STATE_LAST_MESSAGE_SCORE,
+            str(mock.history_score(last_message)),
+        ):
+            logger.info(f"Chat state {codec.as_str(chat_state_key)} last message score set")
+
+
+MIGRATIONS: list[typing.Callable[[redis.Redis], typing.Awaitable[None]]] = [
+    migrate_chat_history_index,
+    migrate_read_pointers,
+    migrate_participant_chats_index,
+    migrate_participants_set_index,
+    migrate_chat_attachments_index,
+    migrate_values_encoding,
+    migrate_chat_message_pointers,
+    migrate_chat_state,
+    migrate_chat_members,
+    migrate_message_reactions,
+    migrate_reactions_summary,
+    migrate_chat_state_last_message_score,
+]
+
+
+async def migrate(connect: redis.Redis) -> None:
+    """
+    Applies all storage migrations. Every migration is idempotent
+    """
+    for migration in MIGRATIONS:
+        logger.info(f"Applying migration {migration.__name__}")
+        await migration(connect)
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    asyncio.run(migrate(connections.RedisBinaryConnectionFactory()()))
@@ -1,62 +1,480 @@
+import datetime
+import functools
+import hashlib
+import itertools
+import typing
 import uuid
 
 import cqrs
-import orjson
 from redis.asyncio import client
 
-from domain import attachments, chats, messages
+from domain import attachments, chats, exceptions as domain_exceptions, messages, reactions
+from infrastructure.database.cache.memory import chats as memory_chats, messages as memory_messages
+from infrastructure.database.persistent import codec
+from service import exceptions
 from service.interfaces import attachment_repository, chat_repository, message_repository
 
-CHAT_HISTORY_PREFIX = "chat_history_{}"
+CHAT_HISTORY_PREFIX = "chat_history_index_{}"
 CHATS_PREFIX = "chat_{}"
 MESSAGES_PREFIX = "message_{}"
-PARTICIPANT_CHATS_PREFIX = "participant_chats_{}"
+PARTICIPANT_CHATS_PREFIX = "participant_chats_index_{}"
+PARTICIPANTS_SET_CHATS_PREFIX = "participants_set_chats_{}"
 ATTACHMENTS_PREFIX = "attachment_{}"
-CHAT_ATTACHMENTS_PREFIX = "chat_attachments_{}"
-READ_MESSAGES_PREFIX = "read_messages_{chat_id}_{participant_id}"
+CHAT_ATTACHMENTS_PREFIX = "chat_attachments_{chat_id}_{content_type}_{status}"
+CHAT_MEMBERS_PREFIX = "chat_members_{}"
+CHAT_FIRST_WRITERS_PREFIX = "chat_first_writers_{}"
+ATTACHMENT_CLAIM_PREFIX = "attachment_claim_{}"
+CHAT_STATE_PREFIX = "chat_state_{}"
+# Version keys are not under prefixes of chat and message values, so scans of values do not meet them
+CHAT_VERSION_PREFIX = "version_chat_{}"
+MESSAGE_VERSION_PREFIX = "version_message_{}"
+CHAT_STATE_LAST_MESSAGE = "last_message"
+# History score of last message, last message is moved only to messages with the same or greater score
+CHAT_STATE_LAST_MESSAGE_SCORE = "last_message_score"
+CHAT_STATE_LAST_ACTIVITY = "last_activity"
+CHAT_STATE_LAST_READ = "last_read_{}"
+MESSAGE_REACTIONS_PREFIX = "message_reactions_{}"
+MESSAGE_REACTORS_PREFIX = "message_reactors_{message_id}_{emoji}"
+MESSAGE_REACTION_COUNTS_PREFIX = "message_reaction_counts_{}"
+MESSAGE_REACTOR_EMOJIS_PREFIX = "message_reactor_emojis_{message_id}_{reactor}"
+MESSAGE_REACTION_FIELD = "{reactor}\n{emoji}"
+READ_POINTER_PREFIX = "read_pointer_{chat_id}_{participant_id}"
+READ_POINTER_MESSAGE_ID = "message_id"
+READ_POINTER_TIMESTAMP = "timestamp"
+READ_POINTER_SEQUENCE = "sequence"
+
+# Chat fields changed by every sent or read message. They are kept in chat state hash instead of chat value
+CHAT_STATE_FIELDS = {
+    "last_message": True,
+    "last_activity_timestamp": True,
+    "participants": {"__all__": {"last_read_message": True}},
+}
+
+# Reactions are changed one by one in message reactions hash instead of message value
+MESSAGE_REACTIONS_FIELDS = {"reactions": True}
+
+# Moves read pointer forward only. Sequence is position of the read message in chat history
+SET_READ_POINTER_SCRIPT = """
+local rank = redis.call('ZRANK', KEYS[1], ARGV[1])
+if not rank then
+    return 0
+end
+local sequence = rank + 1
+local current = tonumber(redis.call('HGET', KEYS[2], 'sequence') or '0')
+if sequence <= current then
+    return current
+end
+redis.call('HSET', KEYS[2], 'message_id', ARGV[1], 'timestamp', ARGV[2], 'sequence', sequence)
+return sequence
+"""
+
+# Adds reaction if message reactions and reactions of the reactor are below limits.
+# Reaction counts by emoji and emojis of the reactor are updated with it.
+# KEYS: reactions, reactors of emoji, reaction counts, emojis of reactor.
+# ARGV: reaction field, reaction value, score, reactor, emoji, total limit, reactor limit.
+# Returns 1 if reaction is added, 0 if it already exists and -1 if limit is reached
+REACT_MESSAGE_SCRIPT = """
+if redis.call('HEXISTS', KEYS[1], ARGV[1]) == 1 then
+    return 0
+end
+if redis.call('HLEN', KEYS[1]) >= tonumber(ARGV[6]) or redis.call('SCARD', KEYS[4]) >= tonumber(ARGV[7]) then
+    return -1
+end
+redis.call('HSET', KEYS[1], ARGV[1], ARGV[2])
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[4])
+redis.call('HINCRBY', KEYS[3], ARGV[5], 1)
+redis.call('SADD', KEYS[4], ARGV[5])
+return 1
+"""
+
+# Removes reaction with its count and emoji of the reactor. Keys are the same as for adding reaction.
+# ARGV: reaction field, reactor, emoji
+UNREACT_MESSAGE_SCRIPT = """
+if redis.call('HDEL', KEYS[1], ARGV[1]) == 0 then
+    return 0
+end
+redis.call('ZREM', KEYS[2], ARGV[2])
+if redis.call('HINCRBY', KEYS[3], ARGV[3], -1) <= 0 then
+    redis.call('HDEL', KEYS[3], ARGV[3])
+end
+redis.call('SREM', KEYS[4], ARGV[3])
+return 1
+"""
+
+# Sends message in one call: checks membership, first writer rule and attachments, then writes message,
+# attachments and chat state and publishes message to recent messages channel. Last message of chat state
+# is moved only to messages created at the same time or later, as chats do. Returns members of chat,
+# their participant chats indexes are updated and notifications are published after the call.
+# KEYS: chat, members, first writers, chat state, chat history, message,
+#       then claim, value and index of every status for each attachment.
+# ARGV: sender, message id, message score, message value, last message pointer, last activity,
+#       recent messages channel, recent messages event,
+#       then id, value, score and position of status for each attachment
+SEND_MESSAGE_SCRIPT = """
+if redis.call('EXISTS', KEYS[1]) == 0 then
+    return {'chat_not_found'}
+end
+if redis.call('SISMEMBER', KEYS[2], ARGV[1]) == 0 then
+    return {'not_participant'}
+end
+if redis.call('HEXISTS', KEYS[4], 'last_message') == 0
+    and redis.call('SCARD', KEYS[3]) > 0
+    and redis.call('SISMEMBER', KEYS[3], ARGV[1]) == 0 then
+    return {'first_writer_required'}
+end
+
+local attachments = (#ARGV - 8) / 4
+local stride = 0
+if attachments > 0 then
+    stride = (#KEYS - 6) / attachments
+end
+for i = 0, attachments - 1 do
+    local claimed = redis.call('GET', KEYS[7 + i * stride])
+    if claimed and claimed ~= ARGV[2] then
+        return {'attachment_already_sent', ARGV[9 + i * 4]}
+    end
+end
+for i = 0, attachments - 1 do
+    local keys_offset, args_offset = 7 + i * stride, 9 + i * 4
+    redis.call('SET', KEYS[keys_offset], ARGV[2])
+    redis.call('SET', KEYS[keys_offset + 1], ARGV[args_offset + 1])
+    for status = 1, stride - 2 do
+        if status == tonumber(ARGV[args_offset + 3]) then
+            redis.call('ZADD', KEYS[keys_offset + 1 + status], ARGV[args_offset + 2], ARGV[args_offset])
+        else
+            redis.call('ZREM', KEYS[keys_offset + 1 + status], ARGV[args_offset])
+        end
+    end
+end
+
+redis.call('ZADD', KEYS[5], ARGV[3], ARGV[2])
+redis.call('SET', KEYS[6], ARGV[4])
+local last_message_score = redis.call('HGET', KEYS[4], 'last_message_score')
+if not last_message_score or tonumber(ARGV[3]) >= tonumber(last_message_score) then
+    redis.call('HSET', KEYS[4], 'last_message', ARGV[5], 'last_message_score', ARGV[3])
+end
+redis.call('HSET', KEYS[4], 'last_activity', ARGV[6])
+redis.call('PUBLISH', ARGV[7], ARGV[8])
+return {'sent', redis.call('SMEMBERS', KEYS[2])}
+"""
+
+
+def history_score(message: messages.Message | messages.MessagePointer) -> float:
+    """
+    Returns score of message in chat history sorted set
+    """
+    return message.created.timestamp()
+
+
+def participants_set_hash(participant_ids: typing.Iterable[str]) -> str:
+    """
+    Returns canonical hash of participants set
+    """
+    return hashlib.sha1("\n".join(sorted(set(participant_ids))).encode()).hexdigest()
+
+
+def attachment_score(attachment: attachments.Attachment) -> float:
+    """
+    Returns score of attachment in chat attachments sorted sets
+    """
+    return attachment.created.timestamp()
+
+
+def attachment_index_keys(attachment: attachments.Attachment) -> dict[attachments.AttachmentStatus, str]:
+    """
+    Returns chat attachments sorted sets of attachment type by status
+    """
+    return {
+        status: CHAT_ATTACHMENTS_PREFIX.format(
+            chat_id=attachment.chat_id,
+            content_type=attachment.content_type.value,
+            status=status.value,
+        )
+        for status in attachments.AttachmentStatus
+    }
+
+
+async def index_attachment(redis_pipeline: client.Pipeline, attachment: attachments.Attachment) -> None:
+    """
+    Puts attachment into chat attachments sorted set of its type and status
+    """
+    for status, attachments_key in attachment_index_keys(attachment).items():
+        if status == attachment.status:
+            await redis_pipeline.zadd(attachments_key, {str(attachment.attachment_id): attachment_score(attachment)})
+        else:
+            await redis_pipeline.zrem(attachments_key, str(attachment.attachment_id))
+
+
+def activity_score(chat: chats.Chat) -> float:
+    """
+    Returns score of chat in participant chats sorted set
+    """
+    return chat.last_activity_timestamp.timestamp()
+
+
+def chat_state(chat: chats.Chat) -> dict[str, bytes]:
+    """
+    Returns fields of chat state hash
+    """
+    state = {CHAT_STATE_LAST_ACTIVITY: chat.last_activity_timestamp.isoformat().encode()}
+    if chat.last_message is not None:
+        state[CHAT_STATE_LAST_MESSAGE] = codec.dump(chat.last_message)
+        state[CHAT_STATE_LAST_MESSAGE_SCORE] = str(history_score(chat.last_message)).encode()
+    for participant in chat.participants.values():
+        if participant.last_read_message is not None:
+            state[CHAT_STATE_LAST_READ.format(participant.account_id)] = codec.dump(participant.last_read_message)
+    return state
+
+
+def apply_chat_state(chat: chats.Chat, state: dict[str, bytes]) -> None:
+    """
+    Sets chat fields from chat state hash. Chats without state keep fields from chat value
+    """
+    if (last_activity := state.get(CHAT_STATE_LAST_ACTIVITY)) is not None:
+        chat.last_activity_timestamp = datetime.datetime.fromisoformat(codec.as_str(last_activity))
+    if (last_message := state.get(CHAT_STATE_LAST_MESSAGE)) is not None:
+        chat.last_message = codec.load(last_message, messages.MessagePointer)
+    for participant in chat.participants.values():
+        if (last_read := state.get(CHAT_STATE_LAST_READ.format(participant.account_id))) is not None:
+            participant.last_read_message = codec.load(last_read, messages.MessagePointer)
+
+
+def dump_message(message: messages.Message) -> bytes:
+    """
+    Encodes message value without reactions
+    """
+    return codec.dump(message, exclude=MESSAGE_REACTIONS_FIELDS)
+
+
+def reaction_field(reaction: reactions.Reaction) -> str:
+    """
+    Returns field of reaction in message reactions hash
+    """
+    return MESSAGE_REACTION_FIELD.format(reactor=reaction.reactor, emoji=reaction.emoji)
+
+
+def reaction_keys(reaction: reactions.Reaction) -> list[str]:
+    """
+    Returns keys changed by adding or removing reaction
+    """
+    return [
+        MESSAGE_REACTIONS_PREFIX.format(reaction.message_id),
+        MESSAGE_REACTORS_PREFIX.format(message_id=reaction.message_id, emoji=reaction.emoji),
+        MESSAGE_REACTION_COUNTS_PREFIX.format(reaction.message_id),
+        MESSAGE_REACTOR_EMOJIS_PREFIX.format(message_id=reaction.message_id, reactor=reaction.reactor),
+    ]
+
+
+async def fetch_messages(
+    redis: client.Redis,
+    *message_ids: uuid.UUID | str | bytes,
+    with_reactions: bool = True,
+) -> list[messages.Message]:
+    """
+    Loads messages in one round trip. Missing messages are skipped.
+    Messages loaded without reactions are for reading, their reactions are given by reactions summary
+    and their version is not loaded
+    """
+    if not message_ids:
+        return []
+
+    async with redis.pipeline(transaction=False) as pipeline:
+        # Versions are read before values, so loaded value is never older than its version
+        if with_reactions:
+            await pipeline.mget(
+                *[MESSAGE_VERSION_PREFIX.format(codec.as_str(message_id)) for message_id in message_ids],
+            )
+        await pipeline.mget(*[MESSAGES_PREFIX.format(codec.as_str(message_id)) for message_id in message_ids])
+        if with_reactions:
+            for message_id in message_ids:
+                await pipeline.hvals(MESSAGE_REACTIONS_PREFIX.format(codec.as_str(message_id)))  # pyright: ignore[reportGeneralTypeIssues]
+        results = await pipeline.execute()
+    if with_reactions:
+        versions, messages_bytes, *messages_reactions = results
+    else:
+        messages_bytes = results[0]
+        versions, messages_reactions = [None] * len(messages_bytes), [[]] * len(messages_bytes)
+
+    result = []
+    for message_bytes, version, reactions_bytes in zip(messages_bytes, versions, messages_reactions):
+        if not message_bytes:
+            continue
+        message = codec.load_message(message_bytes)
+        message.version = int(version or 0)
+        message.reactions = sorted(
+            (codec.load_reaction(reaction_bytes) for reaction_bytes in reactions_bytes),
+            key=lambda reaction: reaction.created,
+        )
+        result.append(message)
+    return result
+
+
+async def bump_version(
+    redis_pipeline: client.Pipeline,
+    versions: dict[str, int],
+    version_key: str,
+    entity: chats.Chat | messages.Message,
+) -> None:
+    """
+    Increments version of written entity. Version loaded first is expected in storage on commit
+    """
+    versions.setdefault(version_key, entity.version)
+    await redis_pipeline.incr(version_key)
+    entity.version += 1
+
+
+def first_writer_ids(chat: chats.Chat) -> frozenset[str]:
+    """
+    Returns participants allowed to write first message in chat
+    """
+    return frozenset(participant.account_id for participant in chat.participants.values() if participant.first_writer)
+
+
+class LoadedChat(typing.NamedTuple):
+    """
+    Stored state of chat loaded by repository
+    """
+
+    last_activity: datetime.datetime | None = None
+    participant_ids: frozenset[str] = frozenset()
+    first_writer_ids: frozenset[str] = frozenset()
+    value: bytes | None = None
+    state: dict[str, bytes] = {}
 
 
 class MockMessageRepository(message_repository.MessageRepository):
-    def __init__(self, redis_pipeline: client.Pipeline):
+    def __init__(self, redis: client.Redis, redis_pipeline: client.Pipeline, versions: dict[str, int]):
+        self._redis = redis
         self._redis_pipeline = redis_pipeline
+        self._versions = versions
         self._seen = set()
+        # Messages loaded or written within current unit of work, so repeated lookups do not go to storage
+        self._loaded: dict[uuid.UUID, messages.Message] = {}
+        self._react_message = redis.register_script(REACT_MESSAGE_SCRIPT)
+        self._unreact_message = redis_pipeline.register_script(UNREACT_MESSAGE_SCRIPT)
 
     async def add(self, message: messages.Message) -> None:
-        await self._redis_pipeline.lpush(  # pyright: ignore[reportGeneralTypeIssues]
+        await self._redis_pipeline.zadd(
             CHAT_HISTORY_PREFIX.format(message.chat_id),
-            str(message.message_id),
-        )
-        await self._redis_pipeline.set(
-            MESSAGES_PREFIX.format(message.message_id),
-            orjson.dumps(message.model_dump(mode="json")),
+            {str(message.message_id): history_score(message)},
         )
+        await self._write_message(message)
         for attachment in message.attachments:
             await self._redis_pipeline.set(
                 ATTACHMENTS_PREFIX.format(attachment.attachment_id),
-                orjson.dumps(attachment.model_dump(mode="json")),
+                codec.dump(attachment),
             )
+            await self._redis_pipeline.set(
+                ATTACHMENT_CLAIM_PREFIX.format(attachment.attachment_id),
+                str(message.message_id),
+            )
+            await index_attachment(self._redis_pipeline, attachment)
             self._seen.add(attachment)
+        self._loaded[message.message_id] = message
         self._seen.add(message)
 
     async def get(self, message_id: uuid.UUID) -> messages.Message | None:
-        message_bytes_coroutine = await self._redis_pipeline.get(
-            MESSAGES_PREFIX.format(message_id),
+        return next(iter(await self.get_many(message_id)), None)
+
+    async def _write_message(self, message: messages.Message) -> None:
+        """
+        Writes message value and publishes it to recent messages of chats of all workers
+        """
+        message_bytes = dump_message(message)
+        await self._redis_pipeline.set(MESSAGES_PREFIX.format(message.message_id), message_bytes)
+        await self._redis_pipeline.publish(
+            memory_messages.RECENT_MESSAGES_CHANNEL,
+            memory_messages.message_event(message.chat_id, message_bytes),
         )
-        message_bytes = (await message_bytes_coroutine.execute())[0]
-        if not message_bytes:
-            return
 
-        message = messages.Message.model_validate(orjson.loads(message_bytes))
-        self._seen.add(message)
-        return message
+    async def get_many(self, *message_ids: uuid.UUID) -> list[messages.Message]:
+        not_loaded_ids = [message_id for message_id in dict.fromkeys(message_ids) if message_id not in self._loaded]
+        for message in await fetch_messages(self._redis, *not_loaded_ids):
+            self._loaded[message.message_id] = message
+            self._seen.add(message)
+
+        return [self._loaded[message_id] for message_id in dict.fromkeys(message_ids) if message_id in self._loaded]
 
     async def update(self, message: messages.Message) -> None:
-        await self._redis_pipeline.set(
-            MESSAGES_PREFIX.format(message.message_id),
-            orjson.dumps(message.model_dump(mode="json")),
+        await bump_version(
+            self._redis_pipeline,
+            self._versions,
+            MESSAGE_VERSION_PREFIX.format(message.message_id),
+            message,
         )
+        await self._write_message(message)
+        self._loaded[message.message_id] = message
         self._seen.add(message)
 
+    async def add_reaction(self, reaction: reactions.Reaction) -> None:
+        # Reaction limits are checked by storage, so reaction is written right away
+        added = await self._react_message(
+            keys=reaction_keys(reaction),
+            args=[
+                reaction_field(reaction),
+                codec.dump(reaction),
+                reaction.created.timestamp(),
+                reaction.reactor,
+                reaction.emoji,
+                messages.TOTAL_EMOJI_NUMBER,
+                messages.EMOJI_PER_REACTOR,
+            ],
+        )
+        if added < 0:  # pyright: ignore[reportOperatorIssue]
+            raise domain_exceptions.TooManyReactions(
+                reactor=reaction.reactor,
+                reaction_id=reaction.reaction_id,
+                message_id=reaction.message_id,
+            )
+
+    async def remove_reaction(self, reaction: reactions.Reaction) -> None:
+        await self._unreact_message(
+            keys=reaction_keys(reaction),
+            args=[reaction_field(reaction), reaction.reactor, reaction.emoji],
+            client=self._redis_pipeline,
+        )
+
+    async def get_reactions_summary(
+        self,
+        account_id: str,
+        *message_ids: uuid.UUID,
+    ) -> list[reactions.ReactionsSummary]:
+        if not message_ids:
+            return []
+
+        async with self._redis.pipeline(transaction=False) as pipeline:
+            for message_id in message_ids:
+                await pipeline.hgetall(MESSAGE_REACTION_COUNTS_PREFIX.format(message_id))  # pyright: ignore[reportGeneralTypeIssues]
+                await pipeline.smembers(  # pyright: ignore[reportGeneralTypeIssues]
+                    MESSAGE_REACTOR_EMOJIS_PREFIX.format(message_id=message_id, reactor=account_id),
+                )
+            result = await pipeline.execute()
+
+        return [
+            reactions.ReactionsSummary(
+                message_id=message_id,
+                counts={codec.as_str(emoji): int(count) for emoji, count in counts.items()},
+                reacted=frozenset(codec.as_str(emoji) for emoji in reacted),
+            )
+            for message_id, counts, reacted in zip(message_ids, result[::2], result[1::2])
+        ]
+
+    async def get_reactors(
+        self,
+        message_id: uuid.UUID,
+        emoji: str,
+        limit: int,
+        offset: int = 0,
+    ) -> tuple[list[str], int]:
+        # Reactors of emoji are ordered by reaction time
+        reactors_key = MESSAGE_REACTORS_PREFIX.format(message_id=message_id, emoji=emoji)
+        async with self._redis.pipeline(transaction=False) as pipeline:
+            await pipeline.zcard(reactors_key)
+            if limit:
+                await pipeline.zrange(reactors_key, offset, offset + limit - 1)
+            count, *reactors = await pipeline.execute()
+        return [codec.as_str(reactor) for reactor in itertools.chain.from_iterable(reactors)], count
+
     def events(self) -> list[cqrs.Event]:
         new_events = []
         for entity in self._seen:
@@ -73,41 +491,253 @@ class MockMessageRepository(message_repository.MessageRepository):
 
 
 class MockChatRepository(chat_repository.ChatRepository):
-    def __init__(self, redis_pipeline: client.Pipeline):
+    def __init__(
+        self,
+        redis: client.Redis,
+        redis_pipeline: client.Pipeline,
+        versions: dict[str, int],
+        cache: memory_chats.ChatCache = memory_chats.chat_cache,
+        recent_messages: memory_messages.RecentMessagesCache = memory_messages.recent_messages_cache,
+    ):
+        self._redis = redis
         self._redis_pipeline = redis_pipeline
+        self._versions = versions
+        self._cache = cache
+        self._recent_messages = recent_messages
         self._seen = set()
-
-    async def add(self, chat: chats.Chat) -> None:
-        for participant in chat.participants:
-            await self._redis_pipeline.lpush(  # pyright: ignore[reportGeneralTypeIssues]
-                PARTICIPANT_CHATS_PREFIX.format(participant.account_id),
-                str(chat.chat_id),
-            )
-        await self._redis_pipeline.set(
-            CHATS_PREFIX.format(chat.chat_id),
-            orjson.dumps(chat.model_dump(mode="json")),
+        # Chats loaded or written within current unit of work, so repeated lookups do not go to storage
+        self._chats: dict[uuid.UUID, chats.Chat] = {}
+        # Stored state of loaded chats, to write only changed values and indexes
+        self._loaded: dict[uuid.UUID, LoadedChat] = {}
+        self._send_message = redis.register_script(SEND_MESSAGE_SCRIPT)
+
+    def _load(self, chat: chats.Chat, chat_bytes: bytes, chat_state_fields: dict[bytes | str, bytes]) -> chats.Chat:
+        state = {codec.as_str(field): value for field, value in chat_state_fields.items()}
+        apply_chat_state(chat, state)
+        self._loaded[chat.chat_id] = LoadedChat(
+            last_activity=chat.last_activity_timestamp,
+            participant_ids=frozenset(participant.account_id for participant in chat.participants.values()),
+            first_writer_ids=first_writer_ids(chat),
+            value=chat_bytes,
+            state=state,
         )
+        self._chats[chat.chat_id] = chat
         self._seen.add(chat)
+        return chat
 
-    async def get(self, chat_id: uuid.UUID) -> chats.Chat | None:
-        chat_bytes_coroutine = await self._redis_pipeline.get(
-            CHATS_PREFIX.format(chat_id),
+    async def _fetch(self, *chat_ids: uuid.UUID | str | bytes) -> list[chats.Chat]:
+        """
+        Loads chats with their version and state in one round trip.
+        Chat values are taken from worker cache when possible, outdated cached values are loaded once more
+        """
+        ids = [uuid.UUID(codec.as_str(chat_id)) for chat_id in chat_ids]
+        not_loaded_ids = [chat_id for chat_id in dict.fromkeys(ids) if chat_id not in self._chats]
+        if not_loaded_ids:
+            await self._fetch_not_loaded(not_loaded_ids)
+
+        return [self._chats[chat_id] for chat_id in ids if chat_id in self._chats]
+
+    async def _fetch_not_loaded(self, chat_ids: list[uuid.UUID]) -> None:
+        cached = {chat_id: entry for chat_id in chat_ids if (entry := self._cache.get(chat_id)) is not None}
+        missed_ids = [chat_id for chat_id in chat_ids if chat_id not in cached]
+        cache_version = self._cache.version
+
+        async with self._redis.pipeline(transaction=False) as pipeline:
+            # Versions are read before values, so loaded value is never older than its version
+            await pipeline.mget(*[CHAT_VERSION_PREFIX.format(chat_id) for chat_id in chat_ids])
+            if missed_ids:
+                await pipeline.mget(*[CHATS_PREFIX.format(chat_id) for chat_id in missed_ids])
+            for chat_id in chat_ids:
+                await pipeline.hgetall(CHAT_STATE_PREFIX.format(chat_id))  # pyright: ignore[reportGeneralTypeIssues]
+            results = await pipeline.execute()
+        versions = {chat_id: int(version or 0) for chat_id, version in zip(chat_ids, results.pop(0))}
+        fetched = dict(zip(missed_ids, results.pop(0))) if missed_ids else {}
+
+        # Invalidation of changed chats could be not delivered yet, so outdated cached values are loaded again
+        if outdated_ids := [chat_id for chat_id, entry in cached.items() if entry.chat_version != versions[chat_id]]:
+            fetched.update(zip(outdated_ids, await self._redis.mget(*map(CHATS_PREFIX.format, outdated_ids))))
+
+        for chat_id, chat_state_fields in zip(chat_ids, results):
+            if chat_id not in fetched:
+                entry = cached[chat_id]
+                chat, chat_bytes = memory_chats.copy_chat(entry.chat), entry.value
+            elif chat_bytes := fetched[chat_id]:
+                chat = codec.load_chat(chat_bytes)
+                self._cache.put(chat_id, chat_bytes, memory_chats.copy_chat(chat), versions[chat_id], cache_version)
+            else:
+                continue
+            chat.version = versions[chat_id]
+            self._load(chat, chat_bytes, chat_state_fields)
+
+    async def _save(self, chat: chats.Chat) -> None:
+        loaded = self._loaded.get(chat.chat_id, LoadedChat())
+        participant_ids = frozenset(participant.account_id for participant in chat.participants.values())
+        chat_first_writer_ids = first_writer_ids(chat)
+        await self._update_participant_chats(chat, loaded, participant_ids)
+        await self._update_members(CHAT_MEMBERS_PREFIX.format(chat.chat_id), loaded.participant_ids, participant_ids)
+        await self._update_members(
+            CHAT_FIRST_WRITERS_PREFIX.format(chat.chat_id),
+            loaded.first_writer_ids,
+            chat_first_writer_ids,
         )
-        chat_bytes = (await chat_bytes_coroutine.execute())[0]
-
-        if not chat_bytes:
-            return
 
-        chat = chats.Chat.model_validate(orjson.loads(chat_bytes))
+        # Chat value changes rarely, hot fields are written to chat state one by one
+        chat_bytes = codec.dump(chat, exclude=CHAT_STATE_FIELDS)
+        if chat_bytes != loaded.value:
+            # Chat state is written field by field, so only changes of chat value are checked for conflicts
+            if chat.chat_id in self._loaded:
+                await bump_version(self._redis_pipeline, self._versions, CHAT_VERSION_PREFIX.format(chat.chat_id), chat)
+            await self._redis_pipeline.set(CHATS_PREFIX.format(chat.chat_id), chat_bytes)
+            # Invalidation message is delivered to every worker, this one included, after commit
+            self._cache.invalidate(chat.chat_id)
+            await self._redis_pipeline.publish(memory_chats.CHAT_INVALIDATIONS_CHANNEL, str(chat.chat_id))
+
+        chat_state_key = CHAT_STATE_PREFIX.format(chat.chat_id)
+        state = chat_state(chat)
+        changed_state = {field: value for field, value in state.items() if loaded.state.get(field) != value}
+        if changed_state:
+            await self._redis_pipeline.hset(chat_state_key, mapping=changed_state)  # pyright: ignore[reportGeneralTypeIssues, reportArgumentType]
+        if removed_fields := loaded.state.keys() - state.keys():
+            await self._redis_pipeline.hdel(chat_state_key, *removed_fields)  # pyright: ignore[reportGeneralTypeIssues]
+
+        self._loaded[chat.chat_id] = LoadedChat(
+            last_activity=chat.last_activity_timestamp,
+            participant_ids=participant_ids,
+            first_writer_ids=chat_first_writer_ids,
+            value=chat_bytes,
+            state=state,
+        )
+        self._chats[chat.chat_id] = chat
         self._seen.add(chat)
-        return chat
+
+    async def _update_members(self, members_key: str, loaded_ids: frozenset[str], ids: frozenset[str]) -> None:
+        if removed_ids := loaded_ids - ids:
+            await self._redis_pipeline.srem(members_key, *removed_ids)  # pyright: ignore[reportGeneralTypeIssues]
+        if added_ids := ids - loaded_ids:
+            await self._redis_pipeline.sadd(members_key, *added_ids)  # pyright: ignore[reportGeneralTypeIssues]
+
+    async def _update_participant_chats(
+        self,
+        chat: chats.Chat,
+        loaded: LoadedChat,
+        participant_ids: frozenset[str],
+    ) -> None:
+        loaded_participant_ids = loaded.participant_ids
+        for participant_id in loaded_participant_ids - participant_ids:
+            await self._redis_pipeline.zrem(PARTICIPANT_CHATS_PREFIX.format(participant_id), str(chat.chat_id))
+
+        if loaded.last_activity != chat.last_activity_timestamp:
+            updated_participant_ids = participant_ids
+        else:
+            updated_participant_ids = participant_ids - loaded_participant_ids
+        for participant_id in updated_participant_ids:
+            await self._redis_pipeline.zadd(
+                PARTICIPANT_CHATS_PREFIX.format(participant_id),
+                {str(chat.chat_id): activity_score(chat)},
+            )
+
+        if participant_ids != loaded_participant_ids:
+            if loaded_participant_ids:
+                await self._redis_pipeline.srem(  # pyright: ignore[reportGeneralTypeIssues]
+                    PARTICIPANTS_SET_CHATS_PREFIX.format(participants_set_hash(loaded_participant_ids)),
+                    str(chat.chat_id),
+                )
+            if participant_ids:
+                await self._redis_pipeline.sadd(  # pyright: ignore[reportGeneralTypeIssues]
+                    PARTICIPANTS_SET_CHATS_PREFIX.format(participants_set_hash(participant_ids)),
+                    str(chat.chat_id),
+                )
+
+    async def add(self, chat: chats.Chat) -> None:
+        await self._save(chat)
+
+    async def get(self, chat_id: uuid.UUID) -> chats.Chat | None:
+        return next(iter(await self._fetch(chat_id)), None)
 
     async def update(self, chat: chats.Chat) -> None:
-        await self._redis_pipeline.set(
-            CHATS_PREFIX.format(chat.chat_id),
-            orjson.dumps(chat.model_dump(mode="json")),
+        await self._save(chat)
+
+    async def is_member(self, chat_id: uuid.UUID, account_id: str) -> bool:
+        return bool(
+            await self._redis.sismember(CHAT_MEMBERS_PREFIX.format(chat_id), account_id),  # pyright: ignore[reportGeneralTypeIssues]
         )
-        self._seen.add(chat)
+
+    async def send_message(
+        self,
+        message: messages.Message,
+        notification: bytes,
+        chat_channel: str | None = None,
+    ) -> None:
+        message_bytes = dump_message(message)
+        keys = [
+            CHATS_PREFIX.format(message.chat_id),
+            CHAT_MEMBERS_PREFIX.format(message.chat_id),
+            CHAT_FIRST_WRITERS_PREFIX.format(message.chat_id),
+            CHAT_STATE_PREFIX.format(message.chat_id),
+            CHAT_HISTORY_PREFIX.format(message.chat_id),
+            MESSAGES_PREFIX.format(message.message_id),
+        ]
+        args = [
+            message.sender,
+            str(message.message_id),
+            history_score(message),
+            message_bytes,
+            codec.dump(message.pointer()),
+            message.created.isoformat(),
+            memory_messages.RECENT_MESSAGES_CHANNEL,
+            memory_messages.message_event(message.chat_id, message_bytes),
+        ]
+        for attachment in message.attachments:
+            index_keys = attachment_index_keys(attachment)
+            keys.extend(
+                [
+                    ATTACHMENT_CLAIM_PREFIX.format(attachment.attachment_id),
+                    ATTACHMENTS_PREFIX.format(attachment.attachment_id),
+                    *index_keys.values(),
+                ],
+            )
+            args.extend(
+                [
+                    str(attachment.attachment_id),
+                    codec.dump(attachment),
+                    attachment_score(attachment),
+                    list(index_keys).index(attachment.status) + 1,
+                ],
+            )
+
+        code, *details = await self._send_message(keys=keys, args=args)
+        match codec.as_str(code):
+            case "sent":
+                await self._notify_members(message, details[0], notification, chat_channel)
+            case "chat_not_found":
+                raise exceptions.ChatNotFound(message.chat_id)
+            case "not_participant":
+                raise exceptions.ParticipantNotInChat(message.sender, message.chat_id)
+            case "first_writer_required":
+                raise exceptions.FirstWriterRequired(message.chat_id, message.sender)
+            case "attachment_already_sent":
+                raise domain_exceptions.AttachmentAlreadySent(uuid.UUID(codec.as_str(details[0])))
+
+    async def _notify_members(
+        self,
+        message: messages.Message,
+        members: typing.Iterable[object],
+        notification: bytes,
+        chat_channel: str | None,
+    ) -> None:
+        # Indexes are moved forward only, so concurrent messages leave the latest activity in them
+        async with self._redis.pipeline(transaction=False) as pipeline:
+            for member in map(codec.as_str, members):
+                await pipeline.zadd(
+                    PARTICIPANT_CHATS_PREFIX.format(member),
+                    {str(message.chat_id): history_score(message)},
+                    gt=True,
+                )
+                if chat_channel is None:
+                    await pipeline.publish(member, notification)
+            if chat_channel is not None:
+                await pipeline.publish(chat_channel, notification)
+            await pipeline.execute()
 
     async def get_chat_history(
         self,
@@ -116,177 +746,173 @@ class MockChatRepository(chat_repository.ChatRepository):
         latest_message_id: uuid.UUID | None = None,
         reverse: bool = False,
     ) -> chats.Chat | None:
-        chat_bytes_coroutine = await self._redis_pipeline.get(
-            CHATS_PREFIX.format(chat_id),
-        )
-        chat_bytes = (await chat_bytes_coroutine.execute())[0]
-
-        if not chat_bytes:
+        chat = await self.get(chat_id)
+        if chat is None:
             return
-        chat = chats.Chat.model_validate(orjson.loads(chat_bytes))
-
-        all_chat_messages_bytes_coroutine = await self._redis_pipeline.lrange(
-            # pyright: ignore[reportGeneralTypeIssues]
-            CHAT_HISTORY_PREFIX.format(chat_id),
-            0,
-            -1,
-        )
 
-        all_chat_messages_bytes = (await all_chat_messages_bytes_coroutine.execute())[0]  # pyright: ignore[reportAttributeAccessIssue]
-        if not all_chat_messages_bytes:
-            self._seen.add(chat)
+        if latest_message_id is None and messages_limit:
+            recent_messages = await self._recent_messages.get_page(
+                chat.chat_id,
+                messages_limit,
+                reverse,
+                functools.partial(self._get_latest_messages_values, chat.chat_id),
+            )
+            if recent_messages is not None:
+                chat.history.extend(recent_messages)
+                return chat
+
+        history_key = CHAT_HISTORY_PREFIX.format(chat_id)
+        start = 0
+        if latest_message_id is not None:
+            # History is ordered by (creation time, message id), so page starts right at the position of cursor
+            # and messages created at the same time are neither repeated nor skipped
+            rank_of = self._redis.zrank if reverse else self._redis.zrevrank
+            cursor_rank = await rank_of(history_key, str(latest_message_id))
+            if cursor_rank is None:
+                return chat
+            start = cursor_rank
+
+        # Page is taken by the keyset from the cursor message, so only page messages are decoded
+        end = start + messages_limit - 1 if messages_limit else -1
+        range_of = self._redis.zrange if reverse else self._redis.zrevrange
+        page_ids = await range_of(history_key, start, end)
+        if not page_ids:
             return chat
 
-        messages_in_chat = [uuid.UUID(message_bytes) for message_bytes in all_chat_messages_bytes]
-
-        messages_list_bytes_coroutine = self._redis_pipeline.mget(
-            *[MESSAGES_PREFIX.format(message_id) for message_id in messages_in_chat],
-        )
-
-        messages_list_bytes = (await messages_list_bytes_coroutine.execute())[0]  # pyright: ignore[reportAttributeAccessIssue]
-
-        sorted_messages = sorted(
-            [messages.Message.model_validate(orjson.loads(mb)) for mb in messages_list_bytes],
-            key=lambda msg: msg.created,
-            reverse=not reverse,
-        )
-
-        add_to_history = latest_message_id is None
-
-        for msg in sorted_messages:
-            if msg.message_id == latest_message_id:
-                add_to_history = True
-            if add_to_history:
-                chat.history.append(msg)
-                if messages_limit and len(chat.history) == messages_limit:
-                    break
+        chat.history.extend(await fetch_messages(self._redis, *page_ids, with_reactions=False))
         return chat
 
-    async def get_all_messages_in_chat(self, chat_id: uuid.UUID) -> list[messages.Message]:
-        all_chat_messages_bytes_coroutine = await self._redis_pipeline.lrange(
-            # pyright: ignore[reportGeneralTypeIssues]
-            CHAT_HISTORY_PREFIX.format(chat_id),
-            0,
-            -1,
-        )
-
-        all_chat_messages_bytes = (await all_chat_messages_bytes_coroutine.execute())[0]  # pyright: ignore[reportAttributeAccessIssue]
-
-        all_messages = []
-        for message in all_chat_messages_bytes:
-            message_id = uuid.UUID(message)
-            message_bytes_coroutine = await self._redis_pipeline.get(
-                MESSAGES_PREFIX.format(message_id),
-            )
-            message_bytes = (await message_bytes_coroutine.execute())[0]
-            if not message_bytes:
-                continue
+    async def _get_latest_messages_values(self, chat_id: uuid.UUID, count: int) -> list[bytes | None]:
+        latest_ids = await self._redis.zrevrange(CHAT_HISTORY_PREFIX.format(chat_id), 0, count - 1)
+        if not latest_ids:
+            return []
+        return await self._redis.mget(*[MESSAGES_PREFIX.format(codec.as_str(message_id)) for message_id in latest_ids])
 
-            all_messages.append(messages.Message.model_validate(orjson.loads(message_bytes)))
+    async def get_all_messages_in_chat(self, chat_id: uuid.UUID) -> list[messages.Message]:
+        all_chat_messages_bytes = await self._redis.zrange(CHAT_HISTORY_PREFIX.format(chat_id), 0, -1)
+        if not all_chat_messages_bytes:
+            return []
 
-        return all_messages
+        return await fetch_messages(self._redis, *all_chat_messages_bytes)
 
-    async def get_next_message_id(
+    async def _get_neighbor_message(
         self,
         chat_id: uuid.UUID,
         target_message_id: uuid.UUID,
+        step: int,
     ) -> messages.Message | None:
-        all_messages = sorted(await self.get_all_messages_in_chat(chat_id), key=lambda msg: msg.created)
+        """
+        Returns message placed `step` positions away from target message in chat history
+        """
+        history_key = CHAT_HISTORY_PREFIX.format(chat_id)
+        rank = await self._redis.zrank(history_key, str(target_message_id))
+        if rank is None or rank + step < 0:
+            return None
 
-        for position, message in enumerate(all_messages):
-            if message.message_id == target_message_id:
-                if position < len(all_messages) - 1:
-                    return all_messages[position + 1]
-                return
+        neighbor_ids = await self._redis.zrange(history_key, rank + step, rank + step)
+        if not neighbor_ids:
+            return None
 
-        return
+        return next(iter(await fetch_messages(self._redis, neighbor_ids[0], with_reactions=False)), None)
 
-    async def get_previous_message_id(
+    async def get_next_message_id(
         self,
         chat_id: uuid.UUID,
         target_message_id: uuid.UUID,
     ) -> messages.Message | None:
-        all_messages = sorted(await self.get_all_messages_in_chat(chat_id), key=lambda msg: msg.created)
+        return await self._get_neighbor_message(chat_id, target_message_id, 1)
 
-        for position, message in enumerate(all_messages):
-            if message.message_id == target_message_id:
-                if position > 0:
-                    return all_messages[position - 1]
-                return
-        return
-
-    async def count_after(
+    async def get_previous_message_id(
         self,
         chat_id: uuid.UUID,
-        message_id: uuid.UUID | None,
-    ) -> int:
-        history = await self.get_chat_history(
-            chat_id,
-            latest_message_id=message_id,
-            reverse=True,
-        )
-        return max(0, len(history.history) - 1) if history else 0
+        target_message_id: uuid.UUID,
+    ) -> messages.Message | None:
+        return await self._get_neighbor_message(chat_id, target_message_id, -1)
 
-    async def count_after_many(
+    async def count_unread_many(
         self,
-        *message: tuple[uuid.UUID, uuid.UUID | None],
+        account_id: str,
+        chat_ids: list[uuid.UUID],
     ) -> list[int]:
-        """
-        Returns count of messages after specified messages
-        """
-        result = []
-        for chat_id, msg_id in message:
-            result.append(await self.count_after(chat_id, msg_id))
-        return result
+        if not chat_ids:
+            return []
+
+        async with self._redis.pipeline(transaction=False) as pipeline:
+            for chat_id in chat_ids:
+                await pipeline.zcard(CHAT_HISTORY_PREFIX.format(chat_id))
+                await pipeline.hget(  # pyright: ignore[reportGeneralTypeIssues]
+                    READ_POINTER_PREFIX.format(chat_id=chat_id, participant_id=account_id),
+                    READ_POINTER_SEQUENCE,
+                )
+            result = await pipeline.execute()
+
+        return [max(0, total - int(sequence or 0)) for total, sequence in zip(result[::2], result[1::2])]
 
     async def get_all(
         self,
         participant: str,
         with_participants: list[str] | None = None,
         strict_participants_search: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+        chat_ids: list[uuid.UUID] | None = None,
     ) -> list[chats.Chat]:
-        participant_chats_bytes_coroutine = await self._redis_pipeline.lrange(
-            # pyright: ignore[reportGeneralTypeIssues]
-            PARTICIPANT_CHATS_PREFIX.format(participant),
-            0,
-            -1,
-        )
-        participant_chats_bytes = (await participant_chats_bytes_coroutine.execute())[0]  # pyright: ignore[reportAttributeAccessIssue]
-        if not participant_chats_bytes:
+        if limit == 0 or chat_ids == []:
             return []
 
-        chat_ides = [uuid.UUID(chat_id_bytes) for chat_id_bytes in participant_chats_bytes]
-        chats_bytes_coroutine = await self._redis_pipeline.mget(
-            *[CHATS_PREFIX.format(chat_id) for chat_id in chat_ides],
-        )
-        chats_bytes = (await chats_bytes_coroutine.execute())[0]
-        if not chats_bytes:
+        participant_chats_key = PARTICIPANT_CHATS_PREFIX.format(participant)
+        if chat_ids is not None and with_participants is None:
+            # Requested chats are checked against the index of participant with one call,
+            # so only requested chats of participant are loaded
+            requested_ids = list(dict.fromkeys(map(str, chat_ids)))
+            scores = await self._redis.zmscore(participant_chats_key, requested_ids)
+            found = sorted(
+                ((chat_id, score) for chat_id, score in zip(requested_ids, scores) if score is not None),
+                key=lambda item: item[1],
+                reverse=True,
+            )
+            found_ids = [chat_id for chat_id, _ in found[offset : None if limit is None else offset + limit]]
+        elif with_participants is None:
+            # Page is taken right from the index ordered by last activity
+            found_ids = await self._redis.zrevrange(
+                participant_chats_key,
+                offset,
+                -1 if limit is None else offset + limit - 1,
+            )
+        elif strict_participants_search:
+            found_ids = list(
+                await self._redis.smembers(  # pyright: ignore[reportGeneralTypeIssues]
+                    PARTICIPANTS_SET_CHATS_PREFIX.format(participants_set_hash([participant, *with_participants])),
+                ),
+            )
+        else:
+            async with self._redis.pipeline(transaction=False) as pipeline:
+                for other_participant in with_participants:
+                    await pipeline.zinter(
+                        [participant_chats_key, PARTICIPANT_CHATS_PREFIX.format(other_participant)],
+                    )
+                found_ids = list(dict.fromkeys(itertools.chain.from_iterable(await pipeline.execute())))
+        if with_participants is not None and chat_ids is not None:
+            requested_ids = set(map(str, chat_ids))
+            found_ids = [chat_id for chat_id in found_ids if codec.as_str(chat_id) in requested_ids]
+        if not found_ids:
             return []
 
-        result = [chats.Chat.model_validate(orjson.loads(chat_bytes)) for chat_bytes in chats_bytes if chat_bytes]
+        result = sorted(
+            await self._fetch(*found_ids),
+            key=lambda chat: chat.last_activity_timestamp,
+            reverse=True,
+        )
         if with_participants is not None:
-            if not strict_participants_search:
-                filtered_result = []
-                for chat in result:
-                    for other_participant in with_participants:
-                        if chat.is_participant(other_participant):
-                            filtered_result.append(chat)
-                result = filtered_result
-            else:
-                filtered_result = []
-                for chat in result:
-                    participants_len = len(chat.participants)
-                    if participants_len == len(with_participants) + 1:
-                        for other_participant in with_participants:
-                            if not chat.is_participant(other_participant):
-                                break
-                        else:
-                            filtered_result.append(chat)
-                result = filtered_result
-
-        sorted_result = sorted(result, key=lambda chat: chat.last_activity_timestamp, reverse=True)
-        self._seen.update(sorted_result)
-        return sorted_result
+            result = result[offset : None if limit is None else offset + limit]
+        return result
+
+    async def count_all(self, participant: str) -> int:
+        return await self._redis.zcard(PARTICIPANT_CHATS_PREFIX.format(participant))
+
+    async def get_ids(self, participant: str) -> list[uuid.UUID]:
+        chat_ids = await self._redis.zrange(PARTICIPANT_CHATS_PREFIX.format(participant), 0, -1)
+        return [uuid.UUID(codec.as_str(chat_id)) for chat_id in chat_ids]
 
     def events(self):
         new_events = []
@@ -297,34 +923,24 @@ class MockChatRepository(chat_repository.ChatRepository):
 
 
 class MockAttachmentRepository(attachment_repository.AttachmentRepository):
-    def __init__(self, redis_pipeline: client.Pipeline):
+    def __init__(self, redis: client.Redis, redis_pipeline: client.Pipeline):
+        self._redis = redis
         self._redis_pipeline = redis_pipeline
         self._seen = set()
+        # Attachments written within current unit of work, they are not in storage before commit
+        self._added: dict[uuid.UUID, attachments.Attachment] = {}
 
     async def add(self, attachment: attachments.Attachment) -> None:
         await self._redis_pipeline.set(
             ATTACHMENTS_PREFIX.format(attachment.attachment_id),
-            orjson.dumps(attachment.model_dump(mode="json")),
-        )
-        await self._redis_pipeline.lpush(  # pyright: ignore[reportGeneralTypeIssues]
-            CHAT_ATTACHMENTS_PREFIX.format(attachment.chat_id),
-            str(attachment.attachment_id),
+            codec.dump(attachment),
         )
+        await index_attachment(self._redis_pipeline, attachment)
+        self._added[attachment.attachment_id] = attachment
         self._seen.add(attachment)
 
     async def get(self, attachment_id: uuid.UUID) -> attachments.Attachment | None:
-        attachment_bytes_coroutine = await self._redis_pipeline.get(
-            ATTACHMENTS_PREFIX.format(attachment_id),
-        )
-        attachment_bytes = (await attachment_bytes_coroutine.execute())[0]
-        if not attachment_bytes:
-            return
-
-        attachment = attachments.Attachment.model_validate(
-            orjson.loads(attachment_bytes),
-        )
-        self._seen.add(attachment)
-        return attachment
+        return next(iter(await self.get_many(attachment_id)), None)
 
     async def get_many(
         self,
@@ -335,17 +951,21 @@ class MockAttachmentRepository(attachment_repository.AttachmentRepository):
         if not attachment_ids:
             return []
 
-        attachments_bytes_coroutine = await self._redis_pipeline.mget(
-            *[ATTACHMENTS_PREFIX.format(attachment_id) for attachment_id in attachment_ids],
+        not_added_ids = [attachment_id for attachment_id in attachment_ids if attachment_id not in self._added]
+        attachments_bytes = (
+            await self._redis.mget(*[ATTACHMENTS_PREFIX.format(attachment_id) for attachment_id in not_added_ids])
+            if not_added_ids
+            else []
         )
-        attachments_bytes = (await attachments_bytes_coroutine.execute())[0]
-        if not attachments_bytes:
-            return []
+        loaded = {
+            attachment.attachment_id: attachment
+            for attachment in map(codec.load_attachment, filter(None, attachments_bytes))
+        }
 
         result = [
-            attachments.Attachment.model_validate(orjson.loads(attachment_bytes))
-            for attachment_bytes in attachments_bytes
-            if attachment_bytes
+            attachment
+            for attachment_id in attachment_ids
+            if (attachment := self._added.get(attachment_id) or loaded.get(attachment_id)) is not None
         ]
         if type_filter:
             result = [attachment for attachment in result if attachment.content_type in type_filter]
@@ -362,41 +982,75 @@ class MockAttachmentRepository(attachment_repository.AttachmentRepository):
         offset: int,
         type_filter: list[attachments.AttachmentType] | None = None,
         status_filter: list[attachments.AttachmentStatus] | None = None,
+        after_attachment_id: uuid.UUID | None = None,
     ) -> list[attachments.Attachment]:
-        attachments_in_chat_bytes_coroutine = await self._redis_pipeline.lrange(
-            # pyright: ignore[reportGeneralTypeIssues]
-            CHAT_ATTACHMENTS_PREFIX.format(chat_id),
-            0,
-            -1,
-        )
-        attachments_in_chat_bytes = (await attachments_in_chat_bytes_coroutine.execute())[0]  # pyright: ignore[reportAttributeAccessIssue]
-        if not attachments_in_chat_bytes:
+        if limit == 0:
             return []
 
-        attachments_bytes_coroutine = await self._redis_pipeline.mget(
-            *[ATTACHMENTS_PREFIX.format(attachment_id) for attachment_id in attachments_in_chat_bytes],
-        )
-        attachments_bytes = (await attachments_bytes_coroutine.execute())[0]
-        if not attachments_bytes:
+        cursor: tuple[float, str] | None = None
+        if after_attachment_id is not None:
+            cursor_attachment = await self.get(after_attachment_id)
+            if cursor_attachment is None:
+                raise exceptions.AttachmentNotFound(after_attachment_id)
+            if cursor_attachment.chat_id != chat_id:
+                raise exceptions.AttachmentNotForChat(after_attachment_id, chat_id)
+            cursor = (attachment_score(cursor_attachment), str(after_attachment_id))
+
+        # Every index is sorted by (creation, attachment id), so the page is merged from the heads of the requested
+        # indexes. Attachments created at the same time as the cursor are read apart and compared by their ids
+        async with self._redis.pipeline(transaction=False) as pipeline:
+            for attachments_key in self._index_keys(chat_id, type_filter, status_filter):
+                await pipeline.zrevrangebyscore(  # pyright: ignore[reportGeneralTypeIssues]
+                    attachments_key,
+                    "+inf" if cursor is None else f"({cursor[0]}",
+                    "-inf",
+                    start=0,
+                    num=offset + limit,
+                    withscores=True,
+                )
+                if cursor is not None:
+                    await pipeline.zrangebyscore(attachments_key, cursor[0], cursor[0], withscores=True)
+            indexed_attachments = [
+                (score, codec.as_str(attachment_id))
+                for attachment_id, score in itertools.chain.from_iterable(await pipeline.execute())
+            ]
+        page = sorted(
+            (indexed for indexed in indexed_attachments if cursor is None or indexed < cursor),
+            reverse=True,
+        )[offset : offset + limit]
+        if not page:
             return []
 
-        result = sorted(
-            [
-                attachments.Attachment.model_validate(orjson.loads(attachment_bytes))
-                for attachment_bytes in attachments_bytes
-                if attachment_bytes
-            ],
-            key=lambda attachment: attachment.created,
-            reverse=True,
+        attachments_bytes = await self._redis.mget(
+            *[ATTACHMENTS_PREFIX.format(attachment_id) for _, attachment_id in page],
         )
 
-        if type_filter:
-            result = [attachment for attachment in result if attachment.content_type in type_filter]
-        if status_filter:
-            result = [attachment for attachment in result if attachment.status in status_filter]
+        result = [codec.load_attachment(attachment_bytes) for attachment_bytes in attachments_bytes if attachment_bytes]
+        self._seen.update(result)
+        return result
 
-        self._seen.update(result[offset : offset + limit])
-        return result[offset : offset + limit]
+    async def count_all(
+        self,
+        chat_id: uuid.UUID,
+        type_filter: list[attachments.AttachmentType] | None = None,
+        status_filter: list[attachments.AttachmentStatus] | None = None,
+    ) -> int:
+        async with self._redis.pipeline(transaction=False) as pipeline:
+            for attachments_key in self._index_keys(chat_id, type_filter, status_filter):
+                await pipeline.zcard(attachments_key)
+            return sum(await pipeline.execute())
+
+    @staticmethod
+    def _index_keys(
+        chat_id: uuid.UUID,
+        type_filter: list[attachments.AttachmentType] | None,
+        status_filter: list[attachments.AttachmentStatus] | None,
+    ) -> list[str]:
+        return [
+            CHAT_ATTACHMENTS_PREFIX.format(chat_id=chat_id, content_type=content_type.value, status=status.value)
+            for content_type in type_filter or attachments.AttachmentType
+            for status in status_filter or attachments.AttachmentStatus
+        ]
 
     def events(self) -> list[cqrs.Event]:
         new_events = []
@@ -407,54 +1061,62 @@ class MockAttachmentRepository(attachment_repository.AttachmentRepository):
 
 
 class MockReadMessageRepository(message_repository.ReadMessageRepository):
-    def __init__(self, redis_pipeline: client.Pipeline):
+    def __init__(self, redis: client.Redis, redis_pipeline: client.Pipeline):
+        self._redis = redis
         self._redis_pipeline = redis_pipeline
         self._seen = set()
+        self._set_read_pointer = redis_pipeline.register_script(SET_READ_POINTER_SCRIPT)
 
     async def last_read(
         self,
         account_id: str,
         chat_id: uuid.UUID,
     ) -> messages.ReedMessage | None:
-        seen_messages_bytes_coroutine = await self._redis_pipeline.lrange(  # pyright: ignore[reportGeneralTypeIssues]
-            READ_MESSAGES_PREFIX.format(
-                chat_id=chat_id,
-                participant_id=account_id,
-            ),
-            0,
-            -1,
-        )
-        if not seen_messages_bytes_coroutine:
-            return None
-
-        seen_messages_bytes = (await seen_messages_bytes_coroutine.execute())[0]  # pyright: ignore[reportAttributeAccessIssue]
-        if not seen_messages_bytes:
-            return None
-
-        seen_message = map(
-            lambda x: messages.ReedMessage.model_validate(orjson.loads(x)),
-            seen_messages_bytes,
-        )
-        last_message = max(seen_message, key=lambda x: x.timestamp)
-        self._seen.add(last_message)
-        return last_message
+        return (await self.last_read_many(account_id, [chat_id]))[0]
 
     async def last_read_many(
         self,
         account_id: str,
         chat_ids: list[uuid.UUID],
     ) -> list[messages.ReedMessage | None]:
+        if not chat_ids:
+            return []
+
+        async with self._redis.pipeline(transaction=False) as pipeline:
+            for chat_id in chat_ids:
+                await pipeline.hmget(  # pyright: ignore[reportGeneralTypeIssues]
+                    READ_POINTER_PREFIX.format(chat_id=chat_id, participant_id=account_id),
+                    [READ_POINTER_MESSAGE_ID, READ_POINTER_TIMESTAMP],
+                )
+            read_pointers = await pipeline.execute()
+
         result = []
-        for chat_id in chat_ids:
-            result.append(await self.last_read(account_id, chat_id))
+        for chat_id, (message_id, timestamp) in zip(chat_ids, read_pointers):
+            if message_id is None or timestamp is None:
+                result.append(None)
+                continue
+
+            last_message = messages.ReedMessage(
+                actor=account_id,
+                message=messages.MessagePointer(
+                    chat_id=chat_id,
+                    message_id=uuid.UUID(codec.as_str(message_id)),
+                    created=datetime.datetime.fromisoformat(codec.as_str(timestamp)),
+                ),
+            )
+            self._seen.add(last_message)
+            result.append(last_message)
 
         return result
 
     async def register(self, message: messages.ReedMessage) -> None:
-        await self._redis_pipeline.lpush(  # pyright: ignore[reportGeneralTypeIssues]
-            READ_MESSAGES_PREFIX.format(
-                chat_id=message.message.chat_id,
-                participant_id=message.actor,
-            ),
-            orjson.dumps(message.model_dump(mode="json")),
+        await self._set_read_pointer(
+            keys=[
+                CHAT_HISTORY_PREFIX.format(message.message.chat_id),
+                READ_POINTER_PREFIX.format(
+                    chat_id=message.message.chat_id,
+                    participant_id=message.actor,
+                ),
+            ],
+            args=[str(message.message.message_id), message.message.created.isoformat()],
         )
@@ -29,6 +29,10 @@ RedisBind = di.bind_by_type(
     dependent.Dependent(redis_connections.RedisConnectionFactory, scope="request"),
     typing.Callable[[], redis.Redis],  # pyright: ignore[reportArgumentType]
 )
+RedisBinaryBind = di.bind_by_type(
+    dependent.Dependent(redis_connections.RedisBinaryConnectionFactory, scope="request"),
+    redis_connections.RedisBinaryConnectionFactory,
+)
 
 AttachmentStorageBind = di.bind_by_type(
     dependent.Dependent(s3.S3AttachmentStorage, scope="request"),
@@ -48,4 +52,5 @@ container.bind(
 container.bind(UoWBind)
 container.bind(BrokerBind)
 container.bind(RedisBind)
+container.bind(RedisBinaryBind)
 container.bind(AttachmentStorageBind)
@@ -2,38 +2,62 @@ import itertools
 import typing
 
 import cqrs
-import redis.asyncio as redis
+import redis
 
+from infrastructure.database.cache.memory import chats as memory_chats, messages as memory_messages
+from infrastructure.database.cache.redis import connections
 from infrastructure.database.persistent import mock
+from service import exceptions
 from service.interfaces import unit_of_work
 
 
 class MockMessageUoW(unit_of_work.UoW):
-    def __init__(self, redis_factory: typing.Callable[[], redis.Redis]):
+    def __init__(self, redis_factory: connections.RedisBinaryConnectionFactory):
         self._redis_factory = redis_factory
 
     async def __aenter__(self):
-        self._redis_pipeline = self._redis_factory().pipeline(transaction=True)
+        memory_chats.chat_cache.start(self._redis_factory)
+        memory_messages.recent_messages_cache.start(self._redis_factory)
+        # Reads go right to storage through the pool, writes are sent in one transaction on commit
+        self._redis = self._redis_factory()
+        self._redis_pipeline = self._redis.pipeline(transaction=True)
+        # Versions of changed aggregates expected in storage on commit
+        self._versions: dict[str, int] = {}
         self.message_repository = mock.MockMessageRepository(
+            redis=self._redis,
             redis_pipeline=self._redis_pipeline,
+            versions=self._versions,
         )
         self.chat_repository = mock.MockChatRepository(
+            redis=self._redis,
             redis_pipeline=self._redis_pipeline,
+            versions=self._versions,
         )
         self.attachment_repository = mock.MockAttachmentRepository(
+            redis=self._redis,
             redis_pipeline=self._redis_pipeline,
         )
         self.read_message_repository = mock.MockReadMessageRepository(
+            redis=self._redis,
             redis_pipeline=self._redis_pipeline,
         )
         return self
 
     async def commit(self):
-        await self._redis_pipeline.execute()
+        if self._versions:
+            # Writes are applied only if versions were not changed since aggregates were loaded
+            await self._redis_pipeline.watch(*self._versions)
+            stored_versions = await self._redis_pipeline.mget(*self._versions)  # pyright: ignore[reportGeneralTypeIssues]
+            if [int(version or 0) for version in stored_versions] != list(self._versions.values()):
+                raise exceptions.ConcurrentUpdate()
+        try:
+            await self._redis_pipeline.execute()
+        except redis.WatchError as error:
+            raise exceptions.ConcurrentUpdate() from error
 
     async def rollback(self):
         try:
-            await self._redis_pipeline.discard()
+            await self._redis_pipeline.reset()
         finally:
             del self._redis_pipeline
 
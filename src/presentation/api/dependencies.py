@@ -7,13 +7,13 @@ from cqrs.container import di as di_container_impl
 from cqrs.events import bootstrap as event_bootstrap
 from cqrs.requests import bootstrap as request_bootstrap
 
-from infrastructure import dependencies
+from infrastructure import dependencies, unit_of_work
 from infrastructure.brokers import messages_broker, redis as redis_broker
 from infrastructure.database.cache.redis import connections
 from infrastructure.storages import s3
 from service import mapping
 from service.handlers.requests.subscriptions import subscription as subscription_service
-from service.interfaces import attachment_storage
+from service.interfaces import attachment_storage, unit_of_work as unit_of_work_interface
 
 logger = logging.getLogger(__name__)
 
@@ -49,6 +49,10 @@ def subscription_broker_factory() -> messages_broker.MessageBroker:
     return redis_broker.RedisMessageBroker(connections.RedisConnectionFactory())
 
 
+def subscription_uow_factory() -> unit_of_work_interface.UoW:
+    return unit_of_work.MockMessageUoW(connections.RedisBinaryConnectionFactory())
+
+
 def attachment_storage_factory() -> attachment_storage.AttachmentStorage:
     return s3.S3AttachmentStorage()
 
@@ -57,5 +61,8 @@ async def subscription_service_factory(
     broker: messages_broker.MessageBroker = fastapi.Depends(
         subscription_broker_factory,
     ),
+    uow: unit_of_work_interface.UoW = fastapi.Depends(
+        subscription_uow_factory,
+    ),
 ) -> subscription_service.SubscriptionService:
-    return subscription_service.SubscriptionService(broker=broker)
+    return subscription_service.SubscriptionService(broker=broker, uow=uow)
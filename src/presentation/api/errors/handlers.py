@@ -149,3 +149,11 @@ def first_writer_required_handler(
     error: service_exceptions.FirstWriterRequired,
 ) -> models.ErrorResponse:
     return models.ErrorResponse(message=str(error))
+
+
+@bind_exception(status.HTTP_409_CONFLICT)
+def concurrent_update_handler(
+    _: requests.Request,
+    error: service_exceptions.ConcurrentUpdate,
+) -> models.ErrorResponse:
+    return models.ErrorResponse(message=str(error))
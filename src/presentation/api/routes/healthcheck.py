@@ -5,6 +5,7 @@ import fastapi
 from fastapi import responses
 
 from infrastructure.brokers import redis
+from infrastructure.database.cache.memory import chats as memory_chats, messages as memory_messages
 from presentation.api import dependencies
 from presentation.api.schema import heathcheck as healthcheck_response
 
@@ -63,3 +64,19 @@ async def healthcheck(
             checks=check_results,
         ).model_dump_json(),
     )
+
+
+@router.get(
+    "/metrics/caches",
+    status_code=fastapi.status.HTTP_200_OK,
+    response_model=list[healthcheck_response.CacheStats],
+)
+async def caches_stats() -> list[healthcheck_response.CacheStats]:
+    """
+    # Statistics of worker caches
+    """
+    caches = {
+        "chats": memory_chats.chat_cache,
+        "recent_messages": memory_messages.recent_messages_cache,
+    }
+    return [healthcheck_response.CacheStats(name=name, **cache.stats()._asdict()) for name, cache in caches.items()]
@@ -1,5 +1,6 @@
 import logging
 import typing
+from urllib import parse
 
 import cqrs
 import fastapi
@@ -26,6 +27,8 @@ logger = logging.getLogger(__name__)
     status_code=status.HTTP_200_OK,
     responses=registry.get_exception_responses(
         exceptions.ChatNotFound,
+        exceptions.AttachmentNotFound,
+        exceptions.AttachmentNotForChat,
         exceptions.GetUserIdError,
         exceptions.UnauthorizedError,
     ),
@@ -34,12 +37,13 @@ async def get_attachments(
     chat_id: pydantic.UUID4,
     limit: pydantic.NonNegativeInt = fastapi.Query(default=10),
     offset: pydantic.NonNegativeInt = fastapi.Query(default=0),
+    after_attachment_id: pydantic.UUID4 | None = fastapi.Query(default=None),
     account_id: str = fastapi.Depends(security.extract_account_id),
     filter_type: typing.Sequence[attachment_entities.AttachmentType] = fastapi.Query(default=[]),
     filter_status: typing.Sequence[attachment_entities.AttachmentStatus] = fastapi.Query(default=[]),
     filter_id: typing.Sequence[pydantic.UUID4] = fastapi.Query(default=[]),
     mediator: cqrs.RequestMediator = fastapi.Depends(dependency=dependencies.request_mediator_factory),
-) -> response.Response[pagination.Pagination[get_attachments_request.AttachmentInfo]]:
+) -> response.Response[pagination.CursorPagination[get_attachments_request.AttachmentInfo]]:
     """
     # Returns all attachments in chat
     """
@@ -49,16 +53,30 @@ async def get_attachments(
             account_id=account_id,
             limit=limit,
             offset=offset,
+            after_attachment_id=after_attachment_id,
             type_filter=list(filter_type),
             status_filter=list(filter_status),
             attachment_id_filter=list(filter_id),
         ),
     )
+    url = f"/v1/chats/{chat_id}/attachments/?" + parse.urlencode(
+        {
+            "filter_type": [attachment_type.value for attachment_type in filter_type],
+            "filter_status": [attachment_status.value for attachment_status in filter_status],
+            "filter_id": list(filter_id),
+        },
+        doseq=True,
+    )
+    # Attachments requested by identifiers are paged by offset, others are paged after the last attachment
     return response.Response(
-        result=pagination.Pagination[get_attachments_request.AttachmentInfo](
-            url=f"/v1/chats/{chat_id}/attachments/?",
+        result=pagination.CursorPagination[get_attachments_request.AttachmentInfo](
+            url=url,
             base_items=result.attachments,
             limit=limit,
             offset=offset,
+            count=result.count,
+            cursor_name="after_attachment_id",
+            cursor=after_attachment_id,
+            next_cursor=result.attachments[-1].attachment_id if result.attachments and not filter_id else None,
         ),
     )
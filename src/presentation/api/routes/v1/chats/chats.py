@@ -113,7 +113,7 @@ async def get_chats(
     mediator: cqrs.RequestMediator = fastapi.Depends(
         dependency=dependencies.request_mediator_factory,
     ),
-) -> response.Response[pagination.Pagination[get_chats_request.ChatInfo]]:
+) -> response.Response[pagination.PagePagination[get_chats_request.ChatInfo]]:
     """
     # Returns chat with specified participant
     """
@@ -123,15 +123,17 @@ async def get_chats(
             chat_ids=chat_id if chat_id else None,
             with_participant_ids=with_participant_id if with_participant_id else None,
             strict_participants_search=strict_participants_search,
+            limit=limit,
+            offset=offset,
         ),
     )
     return response.Response(
-        result=pagination.Pagination[get_chats_request.ChatInfo](
+        result=pagination.PagePagination[get_chats_request.ChatInfo](
             url="/chats/?",
             base_items=result.chats,
             limit=limit,
             offset=offset,
-            count=len(result.chats),
+            count=result.count,
         ),
     )
 
@@ -104,13 +104,14 @@ async def get_reactors(
     # Returns reactors for message reaction
     """
     reactors: get_reactors_request.Reactors = await mediator.send(
-        get_reactors_request.GetReactors(message_id=message_id, emoji=reaction),
+        get_reactors_request.GetReactors(message_id=message_id, emoji=reaction, limit=limit, offset=offset),
     )
     return response.Response(
-        result=pagination.Pagination[str](
+        result=pagination.PagePagination[str](
             url=f"/v1/messages/{message_id}/reactions/?reaction={reaction}",
             base_items=reactors.reactors,
             limit=limit,
             offset=offset,
+            count=reactors.count,
         ),
     )
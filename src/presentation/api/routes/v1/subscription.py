@@ -1,4 +1,3 @@
-import asyncio
 import logging
 
 import fastapi
@@ -31,12 +30,8 @@ async def websocket_endpoint(
     logger.debug(f"Websocket connected to {account_id}")
     async with subscription.start_subscription(account_id):
         try:
-            while True:
+            async for message in subscription.events():
                 try:
-                    message = await subscription.wait_events()
-                    if message is None:
-                        await asyncio.sleep(0.05)
-                        continue
                     logger.debug(f"{account_id} got message {message}")
                     await websocket.send_bytes(message)
                 except (fastapi.WebSocketDisconnect, fastapi.WebSocketException):
@@ -27,3 +27,12 @@ class Healthcheck(pydantic.BaseModel, frozen=True):
         return all(self.checks)
 
     model_config = pydantic.ConfigDict(arbitrary_types_allowed=True)
+
+
+class CacheStats(pydantic.BaseModel, frozen=True):
+    name: str = pydantic.Field(description="Название кеша", examples=["chats"])
+    size: pydantic.NonNegativeInt = pydantic.Field(description="Количество записей")
+    hits: pydantic.NonNegativeInt = pydantic.Field(description="Количество попаданий")
+    misses: pydantic.NonNegativeInt = pydantic.Field(description="Количество промахов")
+    invalidations: pydantic.NonNegativeInt = pydantic.Field(description="Количество сброшенных записей")
+    evictions: pydantic.NonNegativeInt = pydantic.Field(description="Количество вытесненных записей")
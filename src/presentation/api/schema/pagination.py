@@ -68,6 +68,54 @@ class Pagination(pydantic.BaseModel, typing.Generic[Item]):
         )
 
 
+class PagePagination(Pagination, typing.Generic[Item]):
+    """
+    Pagination of items already sliced to the requested page
+    """
+
+    @pydantic.computed_field()
+    @property
+    def items(self) -> typing.Sequence[Item]:
+        return self.base_items[: self.limit]
+
+
+class CursorPagination(PagePagination, typing.Generic[Item]):
+    """
+    Pagination of items already sliced to the requested page.
+    Next page starts after the cursor item if it is set, otherwise it is taken by offset
+    """
+
+    cursor_name: pydantic.StrictStr = pydantic.Field(exclude=True)
+    cursor: pydantic.UUID4 | None = pydantic.Field(default=None, exclude=True)
+    next_cursor: pydantic.UUID4 | None = pydantic.Field(default=None, exclude=True)
+
+    def _cursor_url(self, cursor: pydantic.UUID4 | None) -> str:
+        return self.url if cursor is None else self.url + f"&{self.cursor_name}={cursor}"
+
+    def _combine_url(
+        self,
+        limit: pydantic.NonNegativeInt,
+        offset: pydantic.NonNegativeInt,
+    ) -> str:
+        return (self._cursor_url(self.cursor) + self._pagination_params).format(
+            limit=limit,
+            offset=offset,
+        )
+
+    @pydantic.computed_field()
+    @property
+    def next(self) -> pydantic.StrictStr | None:
+        if len(self.items) < self.limit:
+            return None
+        if self.next_cursor is None:
+            return self._combine_url(limit=self.limit, offset=self.offset + self.limit)
+
+        return (self._cursor_url(self.next_cursor) + self._pagination_params).format(
+            limit=self.limit,
+            offset=0,
+        )
+
+
 class MessagesPaginator(Pagination, typing.Generic[Item]):
     limit: pydantic.NonNegativeInt = pydantic.Field(default=0, exclude=True)
     offset: pydantic.NonNegativeInt = pydantic.Field(default=0, exclude=True)
@@ -82,3 +82,8 @@ class FirstWriterRequired(Exception):
         super().__init__(
             f"Account {account_id} is not allowed to write first in chat {chat_id}",
         )
+
+
+class ConcurrentUpdate(Exception):
+    def __init__(self) -> None:
+        super().__init__("Data was changed concurrently, try again")
@@ -0,0 +1,29 @@
+import typing
+
+import cqrs
+import orjson
+
+from domain import events
+from infrastructure.brokers import messages_broker
+from service.helpers import notifications
+from service.models.ecst_events.chats import deleted_chat
+
+
+class ChatDeletedHandler(cqrs.EventHandler[events.ChatDeleted]):
+    def __init__(self, broker: messages_broker.MessageBroker):
+        self.broker = broker
+
+    async def handle(self, event: events.ChatDeleted) -> None:
+        chat_deleted_event: typing.ByteString = orjson.dumps(
+            cqrs.NotificationEvent[deleted_chat.ChatDeletedPayload](
+                event_name=notifications.CHAT_DELETED_EVENT,
+                payload=deleted_chat.ChatDeletedPayload(
+                    chat_id=event.chat_id,
+                    account_id=event.account_id,
+                ),
+            ).model_dump(mode="json"),
+        )
+        await self.broker.send_message(
+            event.account_id,
+            chat_deleted_event,
+        )
@@ -6,6 +6,7 @@ import orjson
 from domain import events
 from infrastructure.brokers import messages_broker
 from service import exceptions
+from service.helpers import notifications
 from service.interfaces import unit_of_work
 from service.models.ecst_events.chats import new_chat
 from service.validators import chats as chat_validators
@@ -29,7 +30,7 @@ class AddedIntoNewChatHandler(cqrs.EventHandler[events.NewParticipantAdded]):
 
             chat_added_event: typing.ByteString = orjson.dumps(
                 cqrs.NotificationEvent[new_chat.AddedIntoChatPayload](
-                    event_name="AddedIntoChat",
+                    event_name=notifications.ADDED_INTO_CHAT_EVENT,
                     payload=new_chat.AddedIntoChatPayload(
                         chat_id=event.chat_id,
                         account_id=event.account_id,
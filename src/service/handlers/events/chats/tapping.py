@@ -7,6 +7,7 @@ import orjson
 from domain import events
 from infrastructure.brokers import messages_broker
 from service import exceptions
+from service.helpers import notifications
 from service.interfaces import unit_of_work
 from service.validators import chats as chat_validators
 
@@ -30,5 +31,5 @@ class TappingInChatHandler(cqrs.EventHandler[events.TappingInChat]):
                 ).model_dump(mode="json"),
             )
             await asyncio.gather(
-                *[self.broker.send_message(receiver.account_id, message_bytes) for receiver in chat.participants],
+                *[self.broker.send_message(receiver, message_bytes) for receiver in notifications.receivers(chat)],
             )
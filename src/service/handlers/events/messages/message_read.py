@@ -20,10 +20,7 @@ class MessageReadHandler(cqrs.EventHandler[events.MessageRead]):
 
     async def handle(self, event: events.MessageRead) -> None:
         async with self.uow:
-            chat = await self.uow.chat_repository.get(event.chat_id)
-            if chat is None:
-                raise exceptions.ChatNotFound(event.chat_id)
-            chat_validators.raise_if_sender_not_in_chat(chat, event.chat_id, event.reader_id)
+            await chat_validators.raise_if_not_member(self.uow.chat_repository, event.chat_id, event.reader_id)
 
             message = await self.uow.message_repository.get(event.message_id)
             if message is None:
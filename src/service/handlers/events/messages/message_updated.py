@@ -7,6 +7,7 @@ import orjson
 from domain import events as domain_events
 from infrastructure.brokers import messages_broker
 from service import exceptions
+from service.helpers import notifications
 from service.interfaces import unit_of_work
 from service.models.ecst_events.messages import message_updated
 from service.validators import chats as chat_validators, messages as message_validators
@@ -55,6 +56,6 @@ class MessageUpdatedHandler(cqrs.EventHandler[domain_events.MessageUpdated]):
                     ),
                 ).model_dump(mode="json"),
             )
-            sent_tasks = [self.send_to_receiver(message_bytes, receiver.account_id) for receiver in chat.participants]
+            sent_tasks = [self.send_to_receiver(message_bytes, receiver) for receiver in notifications.receivers(chat)]
 
             await asyncio.gather(*sent_tasks)
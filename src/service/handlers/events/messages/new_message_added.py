@@ -2,13 +2,12 @@ import asyncio
 import logging
 
 import cqrs
-import orjson
 
 from domain import events as domain_events
 from infrastructure.brokers import messages_broker
 from service import exceptions
+from service.helpers import notifications
 from service.interfaces import unit_of_work
-from service.models.ecst_events.messages import message_added
 from service.validators import chats as chat_validators, messages as message_validators
 
 logger = logging.getLogger(__name__)
@@ -43,19 +42,7 @@ class NewMessageAddedHandler(cqrs.EventHandler[domain_events.NewMessageAdded]):
                 raise exceptions.MessageNotFound(event.message_id)
             message_validators.raise_if_message_deleted(message)
 
-            message_bytes = orjson.dumps(
-                cqrs.NotificationEvent(
-                    event_name="NewMessageAdded",
-                    payload=message_added.MessageAddedPayload(
-                        chat_id=message.chat_id,
-                        message_id=message.message_id,
-                        sender=message.sender,
-                        content=message.content,
-                        reply_to=message.reply_to,
-                        created=message.created,
-                    ),
-                ).model_dump(mode="json"),
-            )
-            sent_tasks = [self.send_to_receiver(message_bytes, receiver.account_id) for receiver in chat.participants]
+            message_bytes = notifications.new_message_added(message)
+            sent_tasks = [self.send_to_receiver(message_bytes, receiver) for receiver in notifications.receivers(chat)]
 
             await asyncio.gather(*sent_tasks)
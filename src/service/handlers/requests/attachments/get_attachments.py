@@ -1,7 +1,6 @@
 import cqrs
 from cqrs.events import event
 
-from service import exceptions
 from service.interfaces import unit_of_work
 from service.models.attachments import get_attachments
 from service.validators import chats as chat_validators
@@ -22,10 +21,7 @@ class GetAttachmentsHandler(
         request: get_attachments.GetAttachments,
     ) -> get_attachments.Attachments:
         async with self.uow:
-            chat = await self.uow.chat_repository.get(request.chat_id)
-            if chat is None:
-                raise exceptions.ChatNotFound(request.chat_id)
-            chat_validators.raise_if_sender_not_in_chat(chat, request.chat_id, request.account_id)
+            await chat_validators.raise_if_not_member(self.uow.chat_repository, request.chat_id, request.account_id)
 
             if not request.attachment_id_filter:
                 attachments = await self.uow.attachment_repository.get_all(
@@ -34,6 +30,12 @@ class GetAttachmentsHandler(
                     request.offset,
                     type_filter=request.type_filter,
                     status_filter=request.status_filter,
+                    after_attachment_id=request.after_attachment_id,
+                )
+                count = await self.uow.attachment_repository.count_all(
+                    request.chat_id,
+                    type_filter=request.type_filter,
+                    status_filter=request.status_filter,
                 )
             else:
                 attachments = await self.uow.attachment_repository.get_many(
@@ -41,11 +43,13 @@ class GetAttachmentsHandler(
                     type_filter=request.type_filter,
                     status_filter=request.status_filter,
                 )
+                count = len(attachments)
+                attachments = attachments[request.offset : request.offset + request.limit]
 
         return get_attachments.Attachments(
             attachments=[
                 get_attachments.AttachmentInfo(
-                    chat_id=chat.chat_id,
+                    chat_id=request.chat_id,
                     attachment_id=attachment.attachment_id,
                     attachment_status=attachment.status,
                     urls=attachment.urls,  # type: ignore
@@ -56,4 +60,5 @@ class GetAttachmentsHandler(
                 for attachment in attachments
                 if attachment.uploaded
             ],
+            count=count,
         )
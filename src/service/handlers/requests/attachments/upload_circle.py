@@ -7,7 +7,6 @@ import uuid
 import cqrs
 
 from domain import attachments
-from service import exceptions
 from service.interfaces import attachment_storage, unit_of_work
 from service.models.attachments import upload_circle
 from service.helpers.attachments import upload_attachment
@@ -31,10 +30,7 @@ class UploadCircleHandler(cqrs.RequestHandler[upload_circle.UploadCircle, upload
 
     async def handle(self, request: upload_circle.UploadCircle) -> upload_circle.CircleUploaded:
         async with self.uow:
-            chat = await self.uow.chat_repository.get(request.chat_id)
-            if chat is None:
-                raise exceptions.ChatNotFound(request.chat_id)
-            chat_validators.raise_if_sender_not_in_chat(chat, request.chat_id, request.uploader)
+            await chat_validators.raise_if_not_member(self.uow.chat_repository, request.chat_id, request.uploader)
 
             logger.info(
                 f"Processing circle file, size: "
@@ -6,7 +6,6 @@ import cqrs
 from cqrs.events import event
 
 from domain import attachments
-from service import exceptions
 from service.helpers.attachments import upload_attachment
 from service.helpers.attachments.image import blurhash, preview, transcode
 from service.interfaces import attachment_storage, unit_of_work
@@ -29,14 +28,7 @@ class UploadImageHandler(cqrs.RequestHandler[upload_image.UploadImage, upload_im
 
     async def handle(self, request: upload_image.UploadImage) -> upload_image.ImageUploaded:
         async with self.uow:
-            chat = await self.uow.chat_repository.get(request.chat_id)
-            if chat is None:
-                raise exceptions.ChatNotFound(request.chat_id)
-            chat_validators.raise_if_sender_not_in_chat(
-                chat,
-                request.chat_id,
-                request.uploader,
-            )
+            await chat_validators.raise_if_not_member(self.uow.chat_repository, request.chat_id, request.uploader)
 
             transcode_processor = transcode.JpegTranscodeAttachmentPreprocessor()
             preview_100x100_processor = preview.JPEGPreview100x100AttachmentPreprocessor()
@@ -36,10 +36,7 @@ class UploadVoiceHandler(cqrs.RequestHandler[upload_voice.UploadVoice, upload_vo
 
     async def handle(self, request: upload_voice.UploadVoice) -> upload_voice.VoiceUploaded:
         async with self.uow:
-            chat = await self.uow.chat_repository.get(request.chat_id)
-            if chat is None:
-                raise exceptions.ChatNotFound(request.chat_id)
-            chat_validators.raise_if_sender_not_in_chat(chat, request.chat_id, request.uploader)
+            await chat_validators.raise_if_not_member(self.uow.chat_repository, request.chat_id, request.uploader)
 
             decoders_map = {
                 "mp3": histogram.mp3_decoder,
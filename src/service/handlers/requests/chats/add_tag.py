@@ -3,6 +3,7 @@ from cqrs.events import event
 
 from domain import exceptions as domain_exceptions, participants
 from service import exceptions
+from service.helpers import retries
 from service.interfaces import unit_of_work
 from service.models.chats import add_tag
 from service.validators import chats as chat_validators
@@ -16,6 +17,7 @@ class AddTagHandler(cqrs.RequestHandler[add_tag.AddTag, None]):
     def events(self) -> list[event.Event]:
         return list(self.uow.get_events())
 
+    @retries.retry_on_concurrent_update
     async def handle(self, request: add_tag.AddTag) -> None:
         async with self.uow:
             chat = await self.uow.chat_repository.get(request.chat_id)
@@ -3,6 +3,7 @@ from cqrs.events import event
 
 from domain import chats
 from service import exceptions
+from service.helpers import retries
 from service.interfaces import unit_of_work
 from service.models.chats import delete_chat
 
@@ -13,8 +14,9 @@ class DeleteChatHandler(cqrs.RequestHandler[delete_chat.DeleteChat, None]):
 
     @property
     def events(self) -> list[event.Event]:
-        return []
+        return list(self.uow.get_events())
 
+    @retries.retry_on_concurrent_update
     async def handle(self, request: delete_chat.DeleteChat) -> None:
         async with self.uow:
             chat: chats.Chat | None = await self.uow.chat_repository.get(
@@ -1,3 +1,5 @@
+import asyncio
+
 import cqrs
 
 from service.interfaces import unit_of_work
@@ -14,30 +16,31 @@ class GetChatsHandler(cqrs.RequestHandler[get_chats.GetChats, get_chats.Chats]):
 
     async def handle(self, request: get_chats.GetChats) -> get_chats.Chats:
         async with self.uow:
+            # Filtered chats are counted from the found ones and sliced here, only the plain chats list is paged
+            # by storage. Requested chats are looked up by their identifiers, so only they are loaded
+            filtered = request.chat_ids is not None or request.with_participant_ids is not None
             chats = await self.uow.chat_repository.get_all(
                 request.participant,
                 with_participants=request.with_participant_ids,
                 strict_participants_search=request.strict_participants_search,
+                limit=None if filtered else request.limit,
+                offset=0 if filtered else request.offset,
+                chat_ids=request.chat_ids,
             )
-            if request.chat_ids is not None:
-                chats = list(
-                    filter(
-                        lambda chat: chat.chat_id in request.chat_ids or [],  # pyright: ignore[reportOperatorIssue]
-                        chats,
-                    ),
-                )
-            last_read_messages = await self.uow.read_message_repository.last_read_many(
-                account_id=request.participant,
-                chat_ids=[chat.chat_id for chat in chats],
-            )
-            not_read_messages_count = await self.uow.chat_repository.count_after_many(
-                *[
-                    (chat_id, last_message_id)
-                    for chat_id, last_message_id in zip(
-                        [chat.chat_id for chat in chats],
-                        [last_msg.message.message_id if last_msg else None for last_msg in last_read_messages],
-                    )
-                ],
+            if filtered:
+                count = len(chats)
+                chats = chats[request.offset : None if request.limit is None else request.offset + request.limit]
+            else:
+                count = await self.uow.chat_repository.count_all(request.participant)
+            last_read_messages, not_read_messages_count = await asyncio.gather(
+                self.uow.read_message_repository.last_read_many(
+                    account_id=request.participant,
+                    chat_ids=[chat.chat_id for chat in chats],
+                ),
+                self.uow.chat_repository.count_unread_many(
+                    account_id=request.participant,
+                    chat_ids=[chat.chat_id for chat in chats],
+                ),
             )
 
             chats_info = []
@@ -54,7 +57,7 @@ class GetChatsHandler(cqrs.RequestHandler[get_chats.GetChats, get_chats.Chats]):
                     chat_id=chat.chat_id,
                     name=chat.name,
                     avatar=chat.avatar,
-                    participant_ids=[participant.account_id for participant in chat.participants],
+                    participant_ids=list(chat.participants),
                     tags=[tag.tag for tag in participant.tags],
                     not_read_messages_count=not_read_count,
                     last_activity_timestamp=chat.last_activity_timestamp,
@@ -68,4 +71,4 @@ class GetChatsHandler(cqrs.RequestHandler[get_chats.GetChats, get_chats.Chats]):
                 key=lambda x: x.last_activity_timestamp,
                 reverse=True,
             )
-            return get_chats.Chats(chats=list(sorted_chats))
+            return get_chats.Chats(chats=list(sorted_chats), count=count)
@@ -3,6 +3,7 @@ import logging
 import cqrs
 
 from service import exceptions
+from service.helpers import retries
 from service.interfaces import unit_of_work
 from service.models.chats import set_first_writer
 from service.validators import chats as chats_validators
@@ -18,6 +19,7 @@ class SetFirstWriterHandler(cqrs.RequestHandler[set_first_writer.SetFirstWriter,
     def events(self):
         return []
 
+    @retries.retry_on_concurrent_update
     async def handle(self, request: set_first_writer.SetFirstWriter) -> None:
         async with self.uow:
             chat = await self.uow.chat_repository.get(request.chat_id)
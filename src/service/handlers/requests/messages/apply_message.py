@@ -1,6 +1,7 @@
 import cqrs
 
 from service import exceptions
+from service.helpers import retries
 from service.interfaces import unit_of_work
 from service.models.messages import apply_message
 from service.validators import chats as chat_validators, messages as message_validators
@@ -16,6 +17,7 @@ class ApplyMessageHandler(
     def events(self):
         return list(self.uow.get_events())
 
+    @retries.retry_on_concurrent_update
     async def handle(self, request: apply_message.ApplyMessage) -> None:
         async with self.uow:
             # Достаем сообщение
@@ -3,6 +3,7 @@ import logging
 import cqrs
 
 from service import exceptions
+from service.helpers import retries
 from service.interfaces import unit_of_work
 from service.models.messages import delete_message
 from service.validators import messages as message_validators
@@ -18,6 +19,7 @@ class DeleteMessageHandler(cqrs.RequestHandler[delete_message.DeleteMessage, Non
     def events(self):
         return list(self.uow.get_events())
 
+    @retries.retry_on_concurrent_update
     async def handle(self, request: delete_message.DeleteMessage) -> None:
         async with self.uow:
             message = await self.uow.message_repository.get(request.message_id)
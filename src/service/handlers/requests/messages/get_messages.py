@@ -1,4 +1,4 @@
-import itertools
+import asyncio
 
 import cqrs
 
@@ -38,6 +38,19 @@ class GetMessagesHandler(
 
             messages: list[get_messages.MessageInfo] = []
             last_read_message = chat_history.last_read_by(request.account)
+            replied_messages_list, reactions_summaries_list = await asyncio.gather(
+                self.uow.message_repository.get_many(
+                    *[message.reply_to for message in chat_history.history if message.reply_to and not message.deleted],
+                ),
+                self.uow.message_repository.get_reactions_summary(
+                    request.account,
+                    *[message.message_id for message in chat_history.history if not message.deleted],
+                ),
+            )
+            replied_messages = {
+                replied_message.message_id: replied_message for replied_message in replied_messages_list
+            }
+            reactions_summaries = {summary.message_id: summary for summary in reactions_summaries_list}
 
             for message in chat_history.history:
                 if message.deleted:
@@ -45,15 +58,18 @@ class GetMessagesHandler(
 
                 is_message_read = bool(last_read_message) and message.created <= last_read_message.created
 
+                reactions_summary = reactions_summaries[message.message_id]
                 message_reactions = [
                     get_messages.ReactionsUnderMessage(
                         message_id=message.message_id,
                         emoji=emoji,
-                        count=len(list(group)),
+                        count=count,
+                        reacted=emoji in reactions_summary.reacted,
                     )
-                    for emoji, group in itertools.groupby(
-                        message.reactions,
-                        key=lambda r: r.emoji,
+                    for emoji, count in sorted(
+                        reactions_summary.counts.items(),
+                        key=lambda emoji_count: emoji_count[1],
+                        reverse=True,
                     )
                 ]
 
@@ -72,7 +88,7 @@ class GetMessagesHandler(
 
                 replied_message_info = None
                 if message.reply_to:
-                    replied_message = await self.uow.message_repository.get(message.reply_to)
+                    replied_message = replied_messages.get(message.reply_to)
                     if replied_message is not None:
                         replied_message_info = get_messages.MessagePreview(
                             message_id=replied_message.message_id,
@@ -99,21 +115,19 @@ class GetMessagesHandler(
 
             messages.sort(key=lambda m: m.created, reverse=True)
 
-            next_message = (
-                await self.uow.chat_repository.get_next_message_id(
-                    chat_id=request.chat_id,
-                    target_message_id=messages[0].message_id,
-                )
-                if messages
-                else None
-            )
-            prev_message = (
-                await self.uow.chat_repository.get_previous_message_id(
-                    chat_id=request.chat_id,
-                    target_message_id=messages[-1].message_id,
+            next_message, prev_message = (
+                await asyncio.gather(
+                    self.uow.chat_repository.get_next_message_id(
+                        chat_id=request.chat_id,
+                        target_message_id=messages[0].message_id,
+                    ),
+                    self.uow.chat_repository.get_previous_message_id(
+                        chat_id=request.chat_id,
+                        target_message_id=messages[-1].message_id,
+                    ),
                 )
                 if messages
-                else None
+                else (None, None)
             )
 
         return get_messages.Messages(
@@ -143,10 +157,7 @@ class GetMessagePreviewHandler(
                 raise exceptions.MessageNotFound(request.message_id)
             message_validators.raise_if_message_deleted(message)
 
-            chat = await self.uow.chat_repository.get(chat_id=message.chat_id)
-            if chat is None:
-                raise exceptions.ChatNotFound(message.chat_id)
-            chat_validators.raise_if_sender_not_in_chat(chat, message.chat_id, request.account)
+            await chat_validators.raise_if_not_member(self.uow.chat_repository, message.chat_id, request.account)
 
             return get_messages.MessagePreview(
                 message_id=message.message_id,
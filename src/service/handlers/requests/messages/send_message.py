@@ -3,10 +3,10 @@ import logging
 import cqrs
 
 from domain import messages
-from service import exceptions
+from service.helpers import notifications
 from service.interfaces import unit_of_work
 from service.models.messages import send_message
-from service.validators import attachments as attachment_validators, chats as chat_validators
+from service.validators import attachments as attachment_validators
 
 logger = logging.getLogger(__name__)
 
@@ -26,22 +26,6 @@ class SendMessageHandler(
         request: send_message.SendMessage,
     ) -> send_message.MessageSent:
         async with self.uow:
-            chat = await self.uow.chat_repository.get(request.chat_id)
-            if chat is None:
-                raise exceptions.ChatNotFound(request.chat_id)
-            chat_validators.raise_if_sender_not_in_chat(
-                chat,
-                request.chat_id,
-                request.sender,
-            )
-
-            # Enforce first-writer rule via validator
-            chat_validators.raise_if_first_writer_required_and_sender_not_allowed(
-                chat,
-                request.chat_id,
-                request.sender,
-            )
-
             # Check attachments
             attachments = await self.uow.attachment_repository.get_many(*request.attachments)
             attachment_validators.raise_if_attachment_not_found(attachments, request.attachments)
@@ -56,12 +40,15 @@ class SendMessageHandler(
                 content=request.content,
                 attachments=attachments,
             )
-
-            chat.add_message(new_message)
-
-            await self.uow.message_repository.add(new_message)
-            await self.uow.chat_repository.update(chat)
-            await self.uow.commit()
+            for attachment in attachments:
+                attachment.send(new_message.message_id)
+
+            # Membership, first writer rule and writes are made in one call, then participants are notified
+            await self.uow.chat_repository.send_message(
+                new_message,
+                notifications.new_message_added(new_message),
+                notifications.shared_chat_channel(new_message.chat_id),
+            )
 
         return send_message.MessageSent(
             message_id=new_message.message_id,
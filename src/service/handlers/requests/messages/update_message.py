@@ -3,6 +3,7 @@ import logging
 import cqrs
 
 from service import exceptions
+from service.helpers import retries
 from service.interfaces import unit_of_work
 from service.models.messages import update_message as update_message_request
 from service.validators import (
@@ -27,15 +28,13 @@ class UpdateMessageHandler(
     def events(self):
         return list(self.uow.get_events())
 
+    @retries.retry_on_concurrent_update
     async def handle(
         self,
         request: update_message_request.UpdateMessage,
     ) -> update_message_request.MessageUpdated:
         async with self.uow:
-            chat = await self.uow.chat_repository.get(request.chat_id)
-            if chat is None:
-                raise exceptions.ChatNotFound(request.chat_id)
-            chat_validators.raise_if_sender_not_in_chat(chat, request.chat_id, request.updater)
+            await chat_validators.raise_if_not_member(self.uow.chat_repository, request.chat_id, request.updater)
 
             # Check attachments
             attachments = await self.uow.attachment_repository.get_many(*request.attachments)
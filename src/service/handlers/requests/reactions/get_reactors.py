@@ -29,9 +29,11 @@ class GetReactorsHandler(
                 raise exceptions.MessageNotFound(request.message_id)
             message_validators.raise_if_message_deleted(message)
 
-        reactors = []
-        for reaction in message.reactions:
-            if reaction.emoji == request.emoji:
-                reactors.append(reaction.reactor)
+            reactors, count = await self.uow.message_repository.get_reactors(
+                request.message_id,
+                request.emoji,
+                limit=request.limit,
+                offset=request.offset,
+            )
 
-        return get_reactors_request.Reactors(reactors=reactors)
+        return get_reactors_request.Reactors(reactors=reactors, count=count)
@@ -29,5 +29,6 @@ class ReactMessageHandler(cqrs.RequestHandler[react_message.ReactMessage, None])
             )
             message.react(new_reaction)
 
-            await self.uow.message_repository.update(message)
+            # Limits are checked again by storage, so concurrent reactions do not overwrite each other
+            await self.uow.message_repository.add_reaction(new_reaction)
             await self.uow.commit()
@@ -23,7 +23,7 @@ class UnreactMessageHandler(cqrs.RequestHandler[unreact_message.UnreactMessage,
 
             reaction = next(
                 filter(
-                    lambda r: r.emoji == request.reaction,
+                    lambda r: r.emoji == request.reaction and r.reactor == request.unreactor,
                     message.reactions,
                 ),
                 None,
@@ -33,5 +33,5 @@ class UnreactMessageHandler(cqrs.RequestHandler[unreact_message.UnreactMessage,
 
             message.unreact(reaction)
 
-            await self.uow.message_repository.update(message)
+            await self.uow.message_repository.remove_reaction(reaction)
             await self.uow.commit()
@@ -2,8 +2,10 @@ import contextlib
 import logging
 import typing
 
-from infrastructure.brokers import messages_broker
+from infrastructure.brokers import messages_broker, settings
 from service import exceptions
+from service.helpers import notifications
+from service.interfaces import unit_of_work
 
 logger = logging.getLogger(__name__)
 
@@ -16,8 +18,10 @@ class SubscriptionService:
     def __init__(
         self,
         broker: messages_broker.MessageBroker,
+        uow: unit_of_work.UoW,
     ) -> None:
         self.broker = broker
+        self.uow = uow
         self.subscription_started = False
         self.target_account: str | None = None
 
@@ -30,6 +34,11 @@ class SubscriptionService:
             self.target_account = target_account
             await self.broker.start()
             await self.broker.subscribe(target_account)
+            if settings.subscription_hub_settings.CHAT_CHANNELS:
+                # Chats joined after this point are announced to the account channel
+                async with self.uow:
+                    chat_ids = await self.uow.chat_repository.get_ids(target_account)
+                await self.broker.subscribe_many(*map(notifications.chat_channel, chat_ids))
             self.subscription_started = True
             yield self
         except Exception as e:
@@ -39,16 +48,27 @@ class SubscriptionService:
             self.subscription_started = False
             self.target_account = None
 
-    async def wait_events(self) -> bytes | None:
+    async def events(self) -> typing.AsyncIterator[bytes]:
         """
-        Returns new events from broker in real-time mode for the specified account.
+        Yields events from broker in real-time mode for the specified account, as soon as they arrive.
         """
         if not self.subscription_started or not self.target_account:
             raise exceptions.SubscriptionNotStarted()
 
-        event_bytes = await self.broker.get_message()
-        if event_bytes is None:
-            return None
+        async for event_bytes in self.broker.listen():
+            logger.debug(f"Got event from broker: {event_bytes}")
+            if settings.subscription_hub_settings.CHAT_CHANNELS:
+                await self._follow_membership(event_bytes)
+            yield event_bytes
 
-        logger.debug(f"Got event from broker: {event_bytes}")
-        return event_bytes
+    async def _follow_membership(self, event_bytes: bytes) -> None:
+        # Events of chat published before joining it is announced to the account channel are not delivered,
+        # clients are expected to load history of chat they are added into.
+        # Events of chat left, which are queued already, are dropped by broker
+        if (membership_change := notifications.membership_change(event_bytes)) is None:
+            return
+        event_name, chat_id = membership_change
+        if event_name == notifications.ADDED_INTO_CHAT_EVENT:
+            await self.broker.subscribe(notifications.chat_channel(chat_id))
+        else:
+            await self.broker.unsubscribe(notifications.chat_channel(chat_id))
@@ -0,0 +1,60 @@
+import uuid
+
+import cqrs
+import orjson
+
+from domain import chats, messages
+from infrastructure.brokers import settings
+from service.models.ecst_events.messages import message_added
+
+CHAT_CHANNEL_PREFIX = "chat_events_{}"
+ADDED_INTO_CHAT_EVENT = "AddedIntoChat"
+CHAT_DELETED_EVENT = "ChatDeleted"
+MEMBERSHIP_EVENTS = (ADDED_INTO_CHAT_EVENT, CHAT_DELETED_EVENT)
+
+
+def chat_channel(chat_id: uuid.UUID) -> str:
+    """Returns broker channel of events of chat"""
+    return CHAT_CHANNEL_PREFIX.format(chat_id)
+
+
+def shared_chat_channel(chat_id: uuid.UUID) -> str | None:
+    """Returns channel of chat, if events of chat are published once to it instead of channels of participants"""
+    if settings.subscription_hub_settings.CHAT_CHANNELS:
+        return chat_channel(chat_id)
+    return None
+
+
+def receivers(chat: chats.Chat) -> list[str]:
+    """Returns broker channels, which events of chat are sent to"""
+    if (channel := shared_chat_channel(chat.chat_id)) is not None:
+        return [channel]
+    return list(chat.participants)
+
+
+def membership_change(event: bytes) -> tuple[str, uuid.UUID] | None:
+    """Returns name of event and chat, if event is about receiver of event joining or leaving chat"""
+    # Most of events are not about it, so they are not parsed
+    if not any(event_name.encode() in event for event_name in MEMBERSHIP_EVENTS):
+        return None
+    notification = orjson.loads(event)
+    if notification.get("event_name") not in MEMBERSHIP_EVENTS:
+        return None
+    return notification["event_name"], uuid.UUID(notification["payload"]["chat_id"])
+
+
+def new_message_added(message: messages.Message) -> bytes:
+    """Returns notification about new message for chat participants"""
+    return orjson.dumps(
+        cqrs.NotificationEvent(
+            event_name="NewMessageAdded",
+            payload=message_added.MessageAddedPayload(
+                chat_id=message.chat_id,
+                message_id=message.message_id,
+                sender=message.sender,
+                content=message.content,
+                reply_to=message.reply_to,
+                created=message.created,
+            ),
+        ).model_dump(mode="json"),
+    )
@@ -0,0 +1,26 @@
+import functools
+import logging
+import typing
+
+from service import exceptions
+
+logger = logging.getLogger(__name__)
+
+CONCURRENT_UPDATE_ATTEMPTS = 3
+
+Handle = typing.TypeVar("Handle", bound=typing.Callable[..., typing.Awaitable])
+
+
+def retry_on_concurrent_update(handle: Handle) -> Handle:
+    """Handles request again in new unit of work, if its aggregates were changed concurrently"""
+
+    @functools.wraps(handle)
+    async def wrapper(*args, **kwargs):
+        for attempt in range(1, CONCURRENT_UPDATE_ATTEMPTS):
+            try:
+                return await handle(*args, **kwargs)
+            except exceptions.ConcurrentUpdate:
+                logger.debug(f"Concurrent update, attempt {attempt} of {CONCURRENT_UPDATE_ATTEMPTS}")
+        return await handle(*args, **kwargs)
+
+    return typing.cast(Handle, wrapper)
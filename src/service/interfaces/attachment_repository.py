@@ -33,8 +33,18 @@ class AttachmentRepository(typing.Protocol):
         offset: int,
         type_filter: list[attachments.AttachmentType] | None = None,
         status_filter: list[attachments.AttachmentStatus] | None = None,
+        after_attachment_id: uuid.UUID | None = None,
     ) -> list[attachments.Attachment]:
-        """Returns all attachments for specified chat"""
+        """Returns page of chat attachments from newest to oldest, starting after specified attachment"""
+        raise NotImplementedError
+
+    async def count_all(
+        self,
+        chat_id: uuid.UUID,
+        type_filter: list[attachments.AttachmentType] | None = None,
+        status_filter: list[attachments.AttachmentStatus] | None = None,
+    ) -> int:
+        """Returns count of chat attachments of specified types and statuses"""
         raise NotImplementedError
 
     def events(self) -> list[cqrs.Event]:
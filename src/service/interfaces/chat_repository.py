@@ -27,6 +27,26 @@ class ChatRepository(typing.Protocol):
         """
         raise NotImplementedError
 
+    async def is_member(self, chat_id: uuid.UUID, account_id: str) -> bool:
+        """
+        Checks if account is participant of chat without loading the chat
+        """
+        raise NotImplementedError
+
+    async def send_message(
+        self,
+        message: messages.Message,
+        notification: bytes,
+        chat_channel: str | None = None,
+    ) -> None:
+        """
+        Adds message to chat in one atomic call, then publishes notification to chat participants.
+        If chat channel is set, notification is published once to it instead of channels of participants.
+        Raises if chat is not found, sender is not participant, sender can not write first
+        or attachment is already sent
+        """
+        raise NotImplementedError
+
     async def get_chat_history(
         self,
         chat_id: uuid.UUID,
@@ -35,7 +55,7 @@ class ChatRepository(typing.Protocol):
         reverse: bool = False,
     ) -> chats.Chat | None:
         """
-        Returns chat history
+        Returns chat history. Messages of history are loaded without reactions
         """
         raise NotImplementedError
 
@@ -59,22 +79,13 @@ class ChatRepository(typing.Protocol):
         """
         raise NotImplementedError
 
-    async def count_after(
+    async def count_unread_many(
         self,
-        chat_id: uuid.UUID,
-        message_id: uuid.UUID | None,
-    ) -> int:
-        """
-        Returns count of messages after specified message
-        """
-        raise NotImplementedError
-
-    async def count_after_many(
-        self,
-        *message: tuple[uuid.UUID, uuid.UUID | None],
+        account_id: str,
+        chat_ids: list[uuid.UUID],
     ) -> list[int]:
         """
-        Returns count of messages after specified messages
+        Returns count of not read messages by account in specified chats
         """
         raise NotImplementedError
 
@@ -83,9 +94,25 @@ class ChatRepository(typing.Protocol):
         participant: str,
         with_participants: list[str] | None = None,
         strict_participants_search: bool = False,
+        limit: int | None = None,
+        offset: int = 0,
+        chat_ids: list[uuid.UUID] | None = None,
     ) -> list[chats.Chat]:
         """
-        Gets all chats
+        Gets chats of participant ordered by last activity.
+        If chat identifiers are specified, only these chats of participant are loaded
+        """
+        raise NotImplementedError
+
+    async def count_all(self, participant: str) -> int:
+        """
+        Returns count of chats of participant
+        """
+        raise NotImplementedError
+
+    async def get_ids(self, participant: str) -> list[uuid.UUID]:
+        """
+        Returns identifiers of chats of participant without loading the chats
         """
         raise NotImplementedError
 
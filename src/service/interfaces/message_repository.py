@@ -3,7 +3,7 @@ import uuid
 
 import cqrs
 
-from domain import attachments, messages
+from domain import attachments, messages, reactions
 
 
 class MessageRepository(typing.Protocol):
@@ -21,12 +21,52 @@ class MessageRepository(typing.Protocol):
         """
         raise NotImplementedError
 
+    async def get_many(self, *message_ids: uuid.UUID) -> list[messages.Message]:
+        """
+        Gets specified messages. Missing messages are skipped
+        """
+        raise NotImplementedError
+
     async def update(self, message: messages.Message) -> None:
         """
         Changes message status
         """
         raise NotImplementedError
 
+    async def add_reaction(self, reaction: reactions.Reaction) -> None:
+        """
+        Adds reaction to message. Raises if reactions limits of message or reactor are reached
+        """
+        raise NotImplementedError
+
+    async def remove_reaction(self, reaction: reactions.Reaction) -> None:
+        """
+        Removes reaction from message
+        """
+        raise NotImplementedError
+
+    async def get_reactions_summary(
+        self,
+        account_id: str,
+        *message_ids: uuid.UUID,
+    ) -> list[reactions.ReactionsSummary]:
+        """
+        Returns reactions summaries of messages with emojis reacted by account
+        """
+        raise NotImplementedError
+
+    async def get_reactors(
+        self,
+        message_id: uuid.UUID,
+        emoji: str,
+        limit: int,
+        offset: int = 0,
+    ) -> tuple[list[str], int]:
+        """
+        Returns page of accounts reacted to message with emoji and count of them
+        """
+        raise NotImplementedError
+
     def events(self) -> list[cqrs.Event]:
         """
         Returns new domain events
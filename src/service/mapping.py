@@ -2,6 +2,7 @@ from cqrs import events, requests
 
 from domain import events as domain_events
 from service.handlers.events.chats import (
+    deleted_chat as deleted_chat_handler,
     new_chat as new_chat_handler,
     participants as participants_handler,
     tapping as tapping_handler,
@@ -168,3 +169,7 @@ def init_events(mapper: events.EventMap) -> None:
         domain_events.NewParticipantAdded,
         new_chat_handler.AddedIntoNewChatHandler,
     )
+    mapper.bind(
+        domain_events.ChatDeleted,
+        deleted_chat_handler.ChatDeletedHandler,
+    )
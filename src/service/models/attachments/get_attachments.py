@@ -15,6 +15,7 @@ class GetAttachments(cqrs.Request):
     status_filter: list[attachments.AttachmentStatus] = pydantic.Field(default_factory=list)
     attachment_id_filter: list[pydantic.UUID4] = pydantic.Field(default_factory=list)
 
+    after_attachment_id: pydantic.UUID4 | None = None
     limit: pydantic.NonNegativeInt
     offset: pydantic.NonNegativeInt
 
@@ -33,3 +34,4 @@ class AttachmentInfo(pydantic.BaseModel):
 
 class Attachments(cqrs.Response):
     attachments: list[AttachmentInfo]
+    count: pydantic.NonNegativeInt = 0
@@ -10,6 +10,8 @@ class GetChats(cqrs.Request):
     chat_ids: list[pydantic.UUID4] | None = None
     with_participant_ids: list[str] | None = None
     strict_participants_search: bool = False
+    limit: pydantic.NonNegativeInt | None = None
+    offset: pydantic.NonNegativeInt = 0
 
 
 class ChatInfo(cqrs.Response):
@@ -33,3 +35,4 @@ class ChatInfo(cqrs.Response):
 
 class Chats(cqrs.Response):
     chats: typing.Sequence[ChatInfo]
+    count: pydantic.NonNegativeInt = 0
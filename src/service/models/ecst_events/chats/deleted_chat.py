@@ -0,0 +1,6 @@
+import pydantic
+
+
+class ChatDeletedPayload(pydantic.BaseModel, frozen=True):
+    chat_id: pydantic.UUID4
+    account_id: str
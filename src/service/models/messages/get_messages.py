@@ -19,6 +19,7 @@ class ReactionsUnderMessage(cqrs.Request):
     message_id: pydantic.UUID4
     emoji: str
     count: pydantic.PositiveInt
+    reacted: bool = False
 
 
 class MessageInfo(cqrs.Request):
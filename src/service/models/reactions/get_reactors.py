@@ -11,7 +11,10 @@ class GetReactors(cqrs.Request):
         min_length=1,
         examples=["👍", "👎", "❤️"],
     )
+    limit: pydantic.NonNegativeInt
+    offset: pydantic.NonNegativeInt
 
 
 class Reactors(cqrs.Response):
     reactors: typing.Sequence[str]
+    count: pydantic.NonNegativeInt
@@ -2,6 +2,7 @@ import uuid
 
 from domain import chats
 from service import exceptions
+from service.interfaces import chat_repository
 
 
 def raise_if_sender_not_in_chat(
@@ -14,6 +15,21 @@ def raise_if_sender_not_in_chat(
         raise exceptions.ParticipantNotInChat(sender, requested_chat)
 
 
+async def raise_if_not_member(
+    repository: chat_repository.ChatRepository,
+    requested_chat: uuid.UUID,
+    sender: str,
+) -> None:
+    """
+    Checks participant by chat members set. Chat is loaded only to tell missing chat from foreign one
+    """
+    if await repository.is_member(requested_chat, sender):
+        return
+    if await repository.get(requested_chat) is None:
+        raise exceptions.ChatNotFound(requested_chat)
+    raise exceptions.ParticipantNotInChat(sender, requested_chat)
+
+
 def raise_if_first_writer_required_and_sender_not_allowed(
     loaded_chat: chats.Chat,
     requested_chat: uuid.UUID,
@@ -25,7 +41,7 @@ def raise_if_first_writer_required_and_sender_not_allowed(
     """
     if loaded_chat.last_message is not None:
         return
-    if not any(p.first_writer for p in loaded_chat.participants):
+    if not any(p.first_writer for p in loaded_chat.participants.values()):
         return
     participant = loaded_chat.is_participant(sender)
     if participant is None or not participant.first_writer: